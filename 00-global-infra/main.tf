@@ -106,6 +106,11 @@ resource "aws_dynamodb_table" "incidents" {
     type = "S"
   }
 
+  attribute {
+    name = "incident_day"
+    type = "S"
+  }
+
   # GSI for querying by resource
   global_secondary_index {
     name            = "ResourceIndex"
@@ -114,6 +119,16 @@ resource "aws_dynamodb_table" "incidents" {
     projection_type = "ALL"
   }
 
+  # GSI for time-window queries (pattern analysis) - lets readers Query
+  # a day bucket instead of scanning the whole table
+  global_secondary_index {
+    name               = "ByDay"
+    hash_key           = "incident_day"
+    range_key          = "incident_timestamp"
+    projection_type    = "INCLUDE"
+    non_key_attributes = ["resource_type", "triage_results", "event_details"]
+  }
+
   # Enable point-in-time recovery
   point_in_time_recovery {
     enabled = true
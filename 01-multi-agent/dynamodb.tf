@@ -0,0 +1,45 @@
+# DynamoDB table for cached Bedrock responses
+resource "aws_dynamodb_table" "llm_cache" {
+  name         = var.llm_cache_table_name
+  billing_mode = "PAY_PER_REQUEST"
+  hash_key     = "cache_key"
+
+  attribute {
+    name = "cache_key"
+    type = "S"
+  }
+
+  ttl {
+    attribute_name = "ttl"
+    enabled        = true
+  }
+
+  tags = {
+    Name        = var.llm_cache_table_name
+    Environment = "production"
+    ManagedBy   = "terraform"
+  }
+}
+
+# DynamoDB table for cached remediation runbooks
+resource "aws_dynamodb_table" "runbook_cache" {
+  name         = var.runbook_cache_table_name
+  billing_mode = "PAY_PER_REQUEST"
+  hash_key     = "cache_key"
+
+  attribute {
+    name = "cache_key"
+    type = "S"
+  }
+
+  ttl {
+    attribute_name = "ttl"
+    enabled        = true
+  }
+
+  tags = {
+    Name        = var.runbook_cache_table_name
+    Environment = "production"
+    ManagedBy   = "terraform"
+  }
+}
@@ -48,7 +48,9 @@ resource "aws_iam_role_policy" "multi_agent_lambda" {
         ]
         Resource = [
           data.aws_dynamodb_table.incidents.arn,
-          "${data.aws_dynamodb_table.incidents.arn}/index/*"
+          "${data.aws_dynamodb_table.incidents.arn}/index/*",
+          aws_dynamodb_table.llm_cache.arn,
+          aws_dynamodb_table.runbook_cache.arn
         ]
       },
       # Bedrock
@@ -88,7 +90,8 @@ resource "aws_iam_role_policy" "multi_agent_lambda" {
         Effect = "Allow"
         Action = [
           "cloudwatch:PutMetricData",
-          "cloudwatch:GetMetricStatistics"
+          "cloudwatch:GetMetricStatistics",
+          "cloudwatch:GetMetricData"
         ]
         Resource = "*"
       },
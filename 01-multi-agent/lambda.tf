@@ -18,11 +18,13 @@ resource "aws_lambda_function" "multi_agent_orchestrator" {
 
   environment {
     variables = {
-      INCIDENT_TABLE    = var.incident_table_name
-      SNS_TOPIC_ARN     = var.sns_topic_arn
-      CODEBUILD_PROJECT = var.codebuild_project
-      DEFAULT_EMAIL     = var.default_email
-      SENDER_EMAIL      = var.sender_email
+      INCIDENT_TABLE      = var.incident_table_name
+      LLM_CACHE_TABLE     = aws_dynamodb_table.llm_cache.name
+      RUNBOOK_CACHE_TABLE = aws_dynamodb_table.runbook_cache.name
+      SNS_TOPIC_ARN       = var.sns_topic_arn
+      CODEBUILD_PROJECT   = var.codebuild_project
+      DEFAULT_EMAIL       = var.default_email
+      SENDER_EMAIL        = var.sender_email
     }
   }
 
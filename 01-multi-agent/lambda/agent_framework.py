@@ -3,13 +3,148 @@ Multi-Agent Framework for AIOps
 Base classes and coordination logic for agent orchestration
 """
 
+import asyncio
+import hashlib
+import importlib
 import json
+import math
+import os
+import sys
+import time
 import boto3
+from botocore.config import Config
 from abc import ABC, abstractmethod
-from typing import Dict, List, Optional, Any
-from datetime import datetime
+from collections import OrderedDict
+from contextlib import AsyncExitStack
+from dataclasses import dataclass
+from typing import ClassVar, Dict, List, Optional, Any
 from enum import Enum
 
+# aioboto3 is optional in the Lambda layer - fall back to sync boto3 in a
+# worker thread when it is not available
+try:
+    import aioboto3
+except ImportError:
+    aioboto3 = None
+
+# orjson (Rust JSON encoder, 3-10x faster than stdlib) is optional in the
+# Lambda layer - fall back to stdlib json when it is not available
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def json_dumps(obj: Any, default=None, sort_keys: bool = False) -> str:
+    """Serialize to a JSON string with orjson when available"""
+    if orjson is not None:
+        option = orjson.OPT_SORT_KEYS if sort_keys else 0
+        return orjson.dumps(obj, default=default, option=option).decode()
+    return json.dumps(obj, default=default, sort_keys=sort_keys)
+
+
+def json_loads(data) -> Any:
+    """Deserialize JSON (str or bytes) with orjson when available"""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+_aio_session = aioboto3.Session() if aioboto3 else None
+
+# Long-lived aioboto3 clients, keyed by (event loop, service). Entering
+# an aioboto3 client pays credential resolution plus a fresh aiohttp
+# connector (and TLS handshake), so clients are held open for the life
+# of their event loop - the async counterpart of the module-scoped sync
+# clients below. The exit stacks pin the clients open; sockets of closed
+# loops are reclaimed by GC once their entries are pruned.
+_AIO_CLIENTS: Dict = {}
+_AIO_STACKS: Dict = {}
+
+
+async def aio_client(service: str):
+    """Return a shared aioboto3 client for the running event loop"""
+    loop = asyncio.get_running_loop()
+    key = (loop, service)
+    client = _AIO_CLIENTS.get(key)
+    if client is None:
+        for dead in [l for l in _AIO_STACKS if l.is_closed()]:
+            del _AIO_STACKS[dead]
+            for stale in [k for k in _AIO_CLIENTS if k[0] is dead]:
+                del _AIO_CLIENTS[stale]
+        stack = _AIO_STACKS.get(loop)
+        if stack is None:
+            stack = _AIO_STACKS[loop] = AsyncExitStack()
+        client = await stack.enter_async_context(
+            _aio_session.client(service, config=BOTO_CONFIG)
+        )
+        _AIO_CLIENTS[key] = client
+    return client
+
+# Disable Nagle's algorithm on SDK sockets: the agents issue many small
+# latency-bound control-plane calls whose responses otherwise sit behind
+# the delayed-ACK/Nagle interaction (~40ms per call). Newer urllib3
+# releases already set TCP_NODELAY, so the append is guarded
+try:
+    import socket
+    import urllib3.connection
+
+    _NODELAY = (socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+    if _NODELAY not in urllib3.connection.HTTPConnection.default_socket_options:
+        urllib3.connection.HTTPConnection.default_socket_options = (
+            list(urllib3.connection.HTTPConnection.default_socket_options) + [_NODELAY]
+        )
+except (ImportError, AttributeError):
+    pass
+
+# Shared client config: TCP keep-alive and a larger connection pool avoid
+# re-establishing TLS for every AWS API call within a warm container
+BOTO_CONFIG = Config(
+    tcp_keepalive=True,
+    max_pool_connections=50,
+    connect_timeout=3,
+    read_timeout=30,
+    retries={'max_attempts': 3, 'mode': 'adaptive'}
+)
+
+# Module-scoped AWS clients shared by all agent instances - Lambda
+# container reuse keeps these warm instead of paying credential
+# resolution and service-model loading per agent per invocation
+_BEDROCK = boto3.client('bedrock-runtime', config=BOTO_CONFIG)
+_DYNAMODB = boto3.client('dynamodb', config=BOTO_CONFIG)
+_CLOUDWATCH = boto3.client('cloudwatch', config=BOTO_CONFIG)
+_LOGS = boto3.client('logs', config=BOTO_CONFIG)
+
+
+def iso_timestamp() -> str:
+    """
+    Fast ISO-8601 UTC timestamp for log lines
+
+    Avoids allocating a datetime object per call - time.strftime on the
+    cached struct_time plus a microsecond suffix is several times cheaper
+    than datetime.utcnow().isoformat().
+    """
+    t = time.time()
+    return time.strftime('%Y-%m-%dT%H:%M:%S', time.gmtime(t)) + f".{int(t * 1e6) % 1_000_000:06d}"
+
+
+# Per-invocation log buffer - each print() is a separate stdout flush
+# through the Lambda logs pipeline, so lines are accumulated here and
+# written in one batch when the handler flushes at exit
+_LOG_BUF: List[str] = []
+
+
+def buffer_log(log_entry: Dict[str, Any]):
+    """Queue a structured log entry for the next flush_logs()"""
+    _LOG_BUF.append(json_dumps(log_entry, default=str))
+
+
+def flush_logs():
+    """Write all buffered log lines to stdout in a single flush"""
+    if _LOG_BUF:
+        sys.stdout.write('\n'.join(_LOG_BUF) + '\n')
+        sys.stdout.flush()
+        _LOG_BUF.clear()
+
 
 class AgentType(Enum):
     """Agent type enumeration"""
@@ -37,12 +172,318 @@ class AgentStatus(Enum):
     SKIPPED = "skipped"
 
 
+class AgentConfig:
+    """
+    Base class for typed per-agent configs
+
+    Frozen slotted dataclasses replace the nested config dicts: attribute
+    access is a C-level slot load instead of a dict lookup, and the
+    instances are built once at module import since they are fully
+    determined by environment variables. get() keeps existing
+    config.get(key, default) call sites working; None attribute values
+    count as missing so defaults still apply.
+    """
+    __slots__ = ()
+
+    def get(self, key: str, default=None):
+        """Dict-style access for compatibility with untyped call sites"""
+        value = getattr(self, key, None)
+        return default if value is None else value
+
+
+@dataclass(frozen=True, slots=True)
+class TriageConfig(AgentConfig):
+    incident_table: str = 'aiops-incidents'
+    skip_below: tuple = ('INFO', 'LOW')
+
+
+@dataclass(frozen=True, slots=True)
+class TelemetryConfig(AgentConfig):
+    incident_table: str = 'aiops-incidents'
+    region: Optional[str] = None
+
+
+@dataclass(frozen=True, slots=True)
+class RemediationConfig(AgentConfig):
+    incident_table: str = 'aiops-incidents'
+    codebuild_project: str = 'aiops-devops-agent-apply'
+    knowledge_base_id: Optional[str] = None
+
+
+@dataclass(frozen=True, slots=True)
+class RiskConfig(AgentConfig):
+    incident_table: str = 'aiops-incidents'
+    blocked_windows: tuple = ()
+    # Warm-container cache TTLs - tune staleness vs upstream query rate
+    compliance_ttl_seconds: int = 300
+    slo_budget_ttl_seconds: int = 60
+
+
+@dataclass(frozen=True, slots=True)
+class CommsConfig(AgentConfig):
+    incident_table: str = 'aiops-incidents'
+    default_email: str = 'devops@example.com'
+    sender_email: str = 'noreply@example.com'
+    sns_topic_arn: str = ''
+    escalation_emails: tuple = ()
+
+
+class BedrockCache:
+    """
+    Two-tier cache for near-deterministic Bedrock prompts
+
+    Tier 1: exact match on SHA256(prompt + generation params), backed by an
+    in-memory LRU plus a DynamoDB table with a TTL attribute so warm
+    containers and parallel containers both benefit.
+    Tier 2: semantic match - the prompt is embedded with Titan Embeddings
+    and compared against recently cached embeddings; a hit above the
+    cosine-similarity threshold returns the cached response.
+
+    All failures fail open: a broken cache never blocks a Bedrock call.
+    """
+
+    EMBEDDING_MODEL = "amazon.titan-embed-text-v2:0"
+
+    def __init__(
+        self,
+        table_name: str = None,
+        ttl_seconds: int = 3600,
+        max_entries: int = 256,
+        semantic_threshold: float = 0.97
+    ):
+        self.table_name = table_name or os.environ.get('LLM_CACHE_TABLE', 'aiops-llm-cache')
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.semantic_threshold = semantic_threshold
+        self._exact: OrderedDict = OrderedDict()       # key -> response
+        self._embeddings: OrderedDict = OrderedDict()  # key -> (vector, response)
+        self._last_embedding = None                    # (key, vector) from last get()
+
+    @staticmethod
+    def cache_key(prompt: str, max_tokens: int, temperature: float) -> str:
+        """Stable key over prompt and generation parameters"""
+        payload = json_dumps(
+            {'prompt': prompt, 'max_tokens': max_tokens, 'temperature': temperature},
+            sort_keys=True
+        )
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    def get(self, key: str, prompt: str) -> Optional[str]:
+        """Look up a cached response: exact in-memory, DynamoDB, then semantic"""
+        # Tier 1a: in-memory exact hit
+        if key in self._exact:
+            self._exact.move_to_end(key)
+            return self._exact[key]
+
+        # Tier 1b: DynamoDB exact hit
+        try:
+            response = _DYNAMODB.get_item(
+                TableName=self.table_name,
+                Key={'cache_key': {'S': key}}
+            )
+            item = response.get('Item')
+            if item and int(item.get('ttl', {}).get('N', '0')) > int(time.time()):
+                cached = item['response']['S']
+                self._remember(key, cached)
+                return cached
+        except Exception:
+            pass  # Fail open - table may not exist or may be throttled
+
+        # Tier 2: semantic nearest-neighbor over recent embeddings. Only
+        # worth an embedding round trip when there is something to match
+        # against - on an empty store (every cold container) it would add
+        # a guaranteed-miss Bedrock call to the generation path
+        if self._embeddings:
+            vector = self._embed(prompt)
+            if vector:
+                self._last_embedding = (key, vector)
+                for cached_key, (cached_vector, cached_response) in self._embeddings.items():
+                    if self._cosine(vector, cached_vector) >= self.semantic_threshold:
+                        self._remember(key, cached_response)
+                        return cached_response
+
+        return None
+
+    def put(self, key: str, prompt: str, response: str):
+        """Store a fresh response in all cache tiers"""
+        self._remember(key, response)
+
+        try:
+            _DYNAMODB.put_item(
+                TableName=self.table_name,
+                Item={
+                    'cache_key': {'S': key},
+                    'response': {'S': response},
+                    'ttl': {'N': str(int(time.time()) + self.ttl_seconds)}
+                }
+            )
+        except Exception:
+            pass  # Fail open
+
+        # Reuse the embedding computed during get() when possible
+        if self._last_embedding and self._last_embedding[0] == key:
+            vector = self._last_embedding[1]
+        else:
+            vector = self._embed(prompt)
+
+        if vector:
+            self._embeddings[key] = (vector, response)
+            while len(self._embeddings) > self.max_entries:
+                self._embeddings.popitem(last=False)
+
+    def _remember(self, key: str, response: str):
+        """Record an exact-match entry in the in-memory LRU"""
+        self._exact[key] = response
+        self._exact.move_to_end(key)
+        while len(self._exact) > self.max_entries:
+            self._exact.popitem(last=False)
+
+    def _embed(self, prompt: str) -> Optional[List[float]]:
+        """Embed a prompt with Titan Embeddings; None on any failure"""
+        try:
+            response = _BEDROCK.invoke_model(
+                modelId=self.EMBEDDING_MODEL,
+                body=json_dumps({'inputText': prompt[:8000]}),
+                contentType="application/json",
+                accept="application/json"
+            )
+            return json_loads(response.get('body').read()).get('embedding')
+        except Exception:
+            return None
+
+    @staticmethod
+    def _cosine(a: List[float], b: List[float]) -> float:
+        """Cosine similarity between two vectors"""
+        dot = sum(x * y for x, y in zip(a, b))
+        norm = math.sqrt(sum(x * x for x in a)) * math.sqrt(sum(y * y for y in b))
+        return dot / norm if norm else 0.0
+
+
+# Shared cache instance - only consulted for near-deterministic prompts
+_BEDROCK_CACHE = BedrockCache()
+
+# In-process LRU in front of the shared cache: exact prompt repeats
+# within a warm container return without touching DynamoDB. Gated a
+# little wider (temperature <= 0.3) than the shared tiers, since local
+# reuse of a near-deterministic prompt is still the right answer
+_PROMPT_LRU: 'OrderedDict[bytes, str]' = OrderedDict()
+_PROMPT_LRU_MAX = 128
+_PROMPT_LRU_MAX_TEMPERATURE = 0.3
+
+
+def _prompt_lru_key(prompt: str, max_tokens: int, temperature: float) -> bytes:
+    """Compact digest key for the in-process prompt LRU"""
+    return hashlib.blake2b(
+        f"{max_tokens}|{temperature}|{prompt}".encode(), digest_size=16
+    ).digest()
+
+
+def _prompt_lru_get(key: bytes) -> Optional[str]:
+    """Look up a prompt response, refreshing its LRU position"""
+    result = _PROMPT_LRU.get(key)
+    if result is not None:
+        _PROMPT_LRU.move_to_end(key)
+    return result
+
+
+def _prompt_lru_put(key: bytes, result: str):
+    """Store a prompt response, evicting the least recently used"""
+    _PROMPT_LRU[key] = result
+    if len(_PROMPT_LRU) > _PROMPT_LRU_MAX:
+        _PROMPT_LRU.popitem(last=False)
+
+
+class _JsonStreamTracker:
+    """
+    Incremental brace-depth tracker for streamed model output
+
+    Fed one chunk at a time; reports True once the first top-level JSON
+    object closes, so a stream read can stop before the model emits
+    trailing commentary. String literals and escapes are honoured so
+    braces inside values don't skew the depth.
+    """
+
+    __slots__ = ('_depth', '_started', '_closed', '_in_string', '_escaped')
+
+    def __init__(self):
+        self._depth = 0
+        self._started = False
+        self._closed = False
+        self._in_string = False
+        self._escaped = False
+
+    def feed(self, text: str) -> bool:
+        """Consume a chunk; True once the outer object has closed"""
+        if self._closed:
+            return True
+        for ch in text:
+            if self._escaped:
+                self._escaped = False
+            elif self._in_string:
+                if ch == '\\':
+                    self._escaped = True
+                elif ch == '"':
+                    self._in_string = False
+            elif ch == '"':
+                self._in_string = True
+            elif ch == '{':
+                self._depth += 1
+                self._started = True
+            elif ch == '}':
+                self._depth -= 1
+                if self._started and self._depth == 0:
+                    self._closed = True
+                    return True
+        return False
+
+
+def extract_json_fragment(text: str) -> str:
+    """
+    Return the first top-level JSON object in text
+
+    Single-pass brace-depth state machine: no intermediate string
+    copies, braces inside JSON strings are ignored, and any commentary
+    the model emits before or after the object is discarded for free.
+    Shared by every agent that prompts for JSON output.
+    """
+    depth = 0
+    start = -1
+    in_string = False
+    escaped = False
+
+    for i, ch in enumerate(text):
+        if in_string:
+            if escaped:
+                escaped = False
+            elif ch == '\\':
+                escaped = True
+            elif ch == '"':
+                in_string = False
+        elif ch == '"':
+            in_string = True
+        elif ch == '{':
+            if depth == 0:
+                start = i
+            depth += 1
+        elif ch == '}' and depth:
+            depth -= 1
+            if depth == 0:
+                return text[start:i + 1]
+
+    raise ValueError('No JSON object found in model response')
+
+
 class BaseAgent(ABC):
     """
     Abstract base class for all AIOps agents
     All agents must implement analyze() and execute() methods
     """
-    
+
+    # Declared as class attributes (not properties) so registration and
+    # priority sorting work on the class without building an instance
+    agent_type: ClassVar[AgentType]
+    priority: ClassVar[AgentPriority]
+
     def __init__(self, correlation_id: str, config: Dict[str, Any] = None):
         self.correlation_id = correlation_id
         self.config = config or {}
@@ -52,24 +493,12 @@ class BaseAgent(ABC):
         self.start_time = None
         self.end_time = None
         
-        # AWS clients
-        self.bedrock = boto3.client('bedrock-runtime')
-        self.dynamodb = boto3.client('dynamodb')
-        self.cloudwatch = boto3.client('cloudwatch')
-        self.logs = boto3.client('logs')
+        # AWS clients (shared module-scoped instances)
+        self.bedrock = _BEDROCK
+        self.dynamodb = _DYNAMODB
+        self.cloudwatch = _CLOUDWATCH
+        self.logs = _LOGS
         
-    @property
-    @abstractmethod
-    def agent_type(self) -> AgentType:
-        """Return the agent type"""
-        pass
-    
-    @property
-    @abstractmethod
-    def priority(self) -> AgentPriority:
-        """Return the agent priority"""
-        pass
-    
     @abstractmethod
     def analyze(self, context: Dict[str, Any]) -> Dict[str, Any]:
         """
@@ -107,9 +536,15 @@ class BaseAgent(ABC):
         Returns:
             Dict with complete agent results
         """
-        self.start_time = datetime.utcnow()
+        # Reset per-run state - instances are reused across invocations
+        # within a warm container (see AgentRegistry.get_cached_instance),
+        # so agents must not carry state between run() calls
+        self.start_time = time.monotonic()
+        self.end_time = None
         self.status = AgentStatus.RUNNING
-        
+        self.result = None
+
+
         try:
             self.log("INFO", f"{self.agent_type.value} agent starting")
             
@@ -125,7 +560,7 @@ class BaseAgent(ABC):
                 'status': AgentStatus.SUCCESS.value,
                 'analysis': analysis,
                 'execution': execution,
-                'duration_seconds': (datetime.utcnow() - self.start_time).total_seconds()
+                'duration_seconds': time.monotonic() - self.start_time
             }
             
             self.status = AgentStatus.SUCCESS
@@ -140,7 +575,7 @@ class BaseAgent(ABC):
                 'agent_type': self.agent_type.value,
                 'status': AgentStatus.FAILED.value,
                 'error': str(e),
-                'duration_seconds': (datetime.utcnow() - self.start_time).total_seconds()
+                'duration_seconds': time.monotonic() - self.start_time
             }
             
             self.log("ERROR", f"{self.agent_type.value} agent failed: {e}")
@@ -148,34 +583,82 @@ class BaseAgent(ABC):
             return self.result
         
         finally:
-            self.end_time = datetime.utcnow()
-    
+            self.end_time = time.monotonic()
+
+    async def run_async(self, context: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Async wrapper around run() so agents can execute concurrently
+
+        Default implementation offloads the synchronous run() to a worker
+        thread; agents with native async I/O can override this directly.
+        """
+        return await asyncio.to_thread(self.run, context)
+
     def log(self, level: str, message: str, **kwargs):
         """Structured logging"""
         log_entry = {
-            'timestamp': datetime.utcnow().isoformat(),
+            'timestamp': iso_timestamp(),
             'level': level,
             'agent_type': self.agent_type.value,
             'correlation_id': self.correlation_id,
             'message': message,
             **kwargs
         }
-        print(json.dumps(log_entry))
+        buffer_log(log_entry)
     
-    def invoke_bedrock(self, prompt: str, max_tokens: int = 1024, temperature: float = 0.1) -> str:
+    def invoke_bedrock(
+        self,
+        prompt: str,
+        max_tokens: int = 1024,
+        temperature: float = 0.1,
+        stop_marker: str = None,
+        max_chars: int = None,
+        stop_on_json: bool = False
+    ) -> str:
         """
         Helper method to invoke Bedrock (Claude 3 Haiku)
-        
+
+        Streams the generation via invoke_model_with_response_stream and
+        stops reading early once stop_marker or max_chars is reached, so
+        short structured outputs don't wait for the tail of the token
+        budget. Falls back to blocking invoke_model if streaming is
+        unavailable.
+
         Args:
             prompt: The prompt to send to Bedrock
             max_tokens: Maximum tokens in response
             temperature: Temperature for generation
-            
+            stop_marker: Optional substring that ends the read early
+            max_chars: Optional output length bound that ends the read early
+            stop_on_json: Stop reading once the first top-level JSON
+                object in the output closes
+
         Returns:
             LLM response text
         """
+        # Exact repeats within a warm container are served from the
+        # in-process LRU without any network I/O
+        lru_key = None
+        if temperature <= _PROMPT_LRU_MAX_TEMPERATURE:
+            lru_key = _prompt_lru_key(prompt, max_tokens, temperature)
+            cached = _prompt_lru_get(lru_key)
+            if cached is not None:
+                self.log("INFO", "Bedrock prompt LRU hit")
+                return cached
+
+        # Near-deterministic prompts are cacheable
+        cache_key = None
+        if temperature <= 0.1:
+            cache_key = _BEDROCK_CACHE.cache_key(prompt, max_tokens, temperature)
+            cached = _BEDROCK_CACHE.get(cache_key, prompt)
+            if cached is not None:
+                self.log("INFO", "Bedrock cache hit")
+                if lru_key is not None:
+                    _prompt_lru_put(lru_key, cached)
+                return cached
+
         # Amazon Titan Express Configuration
-        body = json.dumps({
+        body = json_dumps({
             "inputText": prompt,
             "textGenerationConfig": {
                 "maxTokenCount": max_tokens,
@@ -184,18 +667,131 @@ class BaseAgent(ABC):
                 "topP": 0.9
             }
         })
-        
+
         try:
+            result = self._invoke_bedrock_streaming(body, stop_marker, max_chars, stop_on_json)
+
+            if lru_key is not None:
+                _prompt_lru_put(lru_key, result)
+            if cache_key is not None:
+                _BEDROCK_CACHE.put(cache_key, prompt, result)
+
+            return result
+
+        except Exception as e:
+            self.log("ERROR", f"Error invoking Bedrock: {e}")
+            return "Error generating response from AI model."
+
+    def _invoke_bedrock_streaming(
+        self,
+        body: str,
+        stop_marker: str = None,
+        max_chars: int = None,
+        stop_on_json: bool = False
+    ) -> str:
+        """Invoke Bedrock with streaming, falling back to invoke_model"""
+        try:
+            response = self.bedrock.invoke_model_with_response_stream(
+                modelId="amazon.titan-text-express-v1",
+                body=body,
+                contentType="application/json",
+                accept="application/json"
+            )
+
+            json_tracker = _JsonStreamTracker() if stop_on_json else None
+            parts = []
+            total = 0
+            for event in response['body']:
+                chunk = json_loads(event['chunk']['bytes'])
+                text = chunk.get('outputText', '')
+                parts.append(text)
+                total += len(text)
+
+                # Early exit: stop pulling chunks once the caller has
+                # what it needs instead of draining the full generation
+                if max_chars is not None and total >= max_chars:
+                    break
+                if stop_marker is not None and stop_marker in text:
+                    break
+                if json_tracker is not None and json_tracker.feed(text):
+                    break
+
+            return ''.join(parts).strip()
+
+        except (AttributeError, KeyError, self.bedrock.exceptions.ClientError):
+            # Streaming unsupported for this model/runtime - block on the
+            # full response instead
             response = self.bedrock.invoke_model(
                 modelId="amazon.titan-text-express-v1",
                 body=body,
                 contentType="application/json",
                 accept="application/json"
             )
-            
-            response_body = json.loads(response.get('body').read())
+            response_body = json_loads(response.get('body').read())
             return response_body.get('results')[0].get('outputText').strip()
-            
+
+    async def invoke_bedrock_async(self, prompt: str, max_tokens: int = 1024, temperature: float = 0.1) -> str:
+        """
+        Async variant of invoke_bedrock
+
+        Uses aioboto3 when available so concurrent Bedrock invocations
+        overlap their network latency; otherwise offloads the sync client
+        to a worker thread.
+        """
+        if _aio_session is None:
+            return await asyncio.to_thread(self.invoke_bedrock, prompt, max_tokens, temperature)
+
+        # In-process LRU first - pure dict lookup, safe on the event loop
+        lru_key = None
+        if temperature <= _PROMPT_LRU_MAX_TEMPERATURE:
+            lru_key = _prompt_lru_key(prompt, max_tokens, temperature)
+            cached = _prompt_lru_get(lru_key)
+            if cached is not None:
+                self.log("INFO", "Bedrock prompt LRU hit")
+                return cached
+
+        # Near-deterministic prompts are cacheable (cache I/O is sync, so
+        # run it in a worker thread to keep the event loop free)
+        cache_key = None
+        if temperature <= 0.1:
+            cache_key = _BEDROCK_CACHE.cache_key(prompt, max_tokens, temperature)
+            cached = await asyncio.to_thread(_BEDROCK_CACHE.get, cache_key, prompt)
+            if cached is not None:
+                self.log("INFO", "Bedrock cache hit")
+                if lru_key is not None:
+                    _prompt_lru_put(lru_key, cached)
+                return cached
+
+        body = json_dumps({
+            "inputText": prompt,
+            "textGenerationConfig": {
+                "maxTokenCount": max_tokens,
+                "stopSequences": [],
+                "temperature": temperature,
+                "topP": 0.9
+            }
+        })
+
+        try:
+            client = await aio_client('bedrock-runtime')
+            response = await client.invoke_model(
+                modelId="amazon.titan-text-express-v1",
+                body=body,
+                contentType="application/json",
+                accept="application/json"
+            )
+            payload = await response['body'].read()
+
+            response_body = json_loads(payload)
+            result = response_body.get('results')[0].get('outputText').strip()
+
+            if lru_key is not None:
+                _prompt_lru_put(lru_key, result)
+            if cache_key is not None:
+                await asyncio.to_thread(_BEDROCK_CACHE.put, cache_key, prompt, result)
+
+            return result
+
         except Exception as e:
             self.log("ERROR", f"Error invoking Bedrock: {e}")
             return "Error generating response from AI model."
@@ -206,22 +802,101 @@ class AgentRegistry:
     Registry for managing available agents
     """
     
+    # Instance memo bound; one entry per distinct (class, config) pair,
+    # which is a handful in practice
+    _MAX_INSTANCES = 32
+
     def __init__(self):
         self._agents = {}
-    
+        self._sorted_classes = {}
+        self._instances: OrderedDict = OrderedDict()
+
     def register(self, agent_class):
         """Register an agent class"""
-        # Create a temporary instance to get agent_type
-        temp_instance = agent_class(correlation_id="temp", config={})
-        self._agents[temp_instance.agent_type] = agent_class
+        # agent_type is a class attribute, so no instance (and none of its
+        # boto3 clients) is needed at registration time
+        self._agents[agent_class.agent_type] = agent_class
+        self._sorted_classes.clear()
         return agent_class
-    
+
+    def register_lazy(self, agent_type: AgentType, ref: str):
+        """
+        Register an agent by 'module:ClassName' reference without importing it
+
+        The module is only imported the first time the agent type is
+        requested, so cold starts don't pay import (and client
+        construction) cost for agents that never run.
+        """
+        self._agents.setdefault(agent_type, ref)
+
+    def _resolve(self, agent_type: AgentType):
+        """Resolve a lazy 'module:ClassName' reference to the agent class"""
+        entry = self._agents.get(agent_type)
+        if isinstance(entry, str):
+            module_name, class_name = entry.split(':')
+            # Importing the module normally re-registers the class via the
+            # @agent_registry.register decorator
+            module = importlib.import_module(module_name)
+            entry = self._agents.get(agent_type)
+            if isinstance(entry, str):
+                entry = getattr(module, class_name)
+                self._agents[agent_type] = entry
+        return entry
+
     def get_agent(self, agent_type: AgentType, correlation_id: str, config: Dict[str, Any] = None):
         """Get an agent instance by type"""
-        agent_class = self._agents.get(agent_type)
+        agent_class = self._resolve(agent_type)
         if not agent_class:
             raise ValueError(f"Agent type {agent_type} not registered")
-        return agent_class(correlation_id=correlation_id, config=config)
+        return self.get_cached_instance(agent_class, correlation_id, config)
+
+    def get_cached_instance(self, agent_class, correlation_id: str, config=None):
+        """
+        Return a reusable agent instance for (class, config)
+
+        Instances are memoized by config contents - hashed directly when
+        the config supports it, otherwise via a canonical JSON rendering -
+        so a rebuilt config with equal values reuses the same instance and
+        two different configs can never alias one. Only the correlation_id
+        is rebound per incident; run() resets all other per-run state, so
+        reuse is safe as long as agents stay stateless between calls.
+        """
+        try:
+            hash(config)
+            key = (agent_class, config)
+        except TypeError:
+            # Dict configs (and dataclasses holding dicts) aren't
+            # hashable; a sorted-key serialization of their contents is
+            key = (agent_class, json_dumps(config, default=str, sort_keys=True))
+        agent = self._instances.get(key)
+        if agent is None:
+            agent = agent_class(correlation_id=correlation_id, config=config)
+            self._instances[key] = agent
+            if len(self._instances) > self._MAX_INSTANCES:
+                self._instances.popitem(last=False)
+        else:
+            agent.correlation_id = correlation_id
+        return agent
+
+    def get_sorted_classes(self, agent_types: List[AgentType]) -> tuple:
+        """
+        Return agent classes for the requested types, sorted by priority
+
+        The sorted tuple is cached per distinct set of requested types so
+        repeat invocations (the common warm-Lambda case) skip the sort.
+        """
+        key = frozenset(agent_types)
+        cached = self._sorted_classes.get(key)
+        if cached is None:
+            classes = []
+            for agent_type in agent_types:
+                agent_class = self._resolve(agent_type)
+                if not agent_class:
+                    raise ValueError(f"Agent type {agent_type} not registered")
+                classes.append(agent_class)
+            cached = tuple(sorted(classes, key=lambda c: c.priority.value))
+            self._sorted_classes[key] = cached
+        return cached
     
     def list_agents(self) -> List[AgentType]:
         """List all registered agent types"""
@@ -240,7 +915,7 @@ class AgentCoordinator:
         self.results = {}
         self.execution_order = []
         
-    def orchestrate(
+    async def orchestrate(
         self,
         context: Dict[str, Any],
         agent_types: List[AgentType],
@@ -248,72 +923,137 @@ class AgentCoordinator:
     ) -> Dict[str, Any]:
         """
         Orchestrate execution of multiple agents
-        
+
+        Agents are grouped into "waves" by priority: agents sharing a
+        priority have no data dependency on each other, so each wave runs
+        concurrently with asyncio.gather while waves themselves execute in
+        priority order. Wall-clock per wave is max(agent latency) instead
+        of the sum.
+
         Args:
             context: Incident context
             agent_types: List of agent types to execute
             config: Per-agent configuration
-            
+
         Returns:
             Dict with all agent results
         """
         config = config or {}
-        
-        # Sort agents by priority
-        agents = []
-        for agent_type in agent_types:
-            agent_config = config.get(agent_type, {})
-            agent = self.registry.get_agent(agent_type, self.correlation_id, agent_config)
-            agents.append(agent)
-        
-        agents.sort(key=lambda a: a.priority.value)
-        
-        self.log("INFO", f"Orchestrating {len(agents)} agents")
-        
-        # Execute agents in priority order
+
+        # Agent classes come back pre-sorted by priority (cached per set of
+        # requested types), so no per-invocation sort is needed
+        agents = [
+            self.registry.get_cached_instance(
+                agent_class,
+                self.correlation_id,
+                # None (not a fresh {}) keeps the memo key stable when an
+                # agent has no config
+                config.get(agent_class.agent_type)
+            )
+            for agent_class in self.registry.get_sorted_classes(agent_types)
+        ]
+
+        # Group agents into priority waves (dict preserves insertion order)
+        waves: Dict[int, List[BaseAgent]] = {}
         for agent in agents:
-            self.log("INFO", f"Executing {agent.agent_type.value} agent")
-            
-            # Add previous results to context
-            enhanced_context = {
-                **context,
-                'previous_agent_results': self.results
-            }
-            
-            # Run agent
-            result = agent.run(enhanced_context)
-            
-            # Store result
-            self.results[agent.agent_type.value] = result
-            self.execution_order.append(agent.agent_type.value)
-            
-            # Check if agent failed critically
-            if result.get('status') == AgentStatus.FAILED.value:
-                critical_failure = result.get('critical_failure', False)
-                if critical_failure:
-                    self.log("ERROR", f"Critical failure in {agent.agent_type.value} agent, stopping orchestration")
-                    break
-        
+            waves.setdefault(agent.priority.value, []).append(agent)
+
+        self.log("INFO", f"Orchestrating {len(agents)} agents in {len(waves)} waves")
+
+        # Expose previous results through the shared context once instead of
+        # copying the full context per agent - self.results is mutated in
+        # place between waves so the reference stays live
+        context.setdefault('previous_agent_results', self.results)
+
+        # Execute waves in priority order, agents within a wave concurrently
+        stop_orchestration = False
+        noop = False
+        for priority_value, wave in waves.items():
+            self.log("INFO", f"Executing wave (priority {priority_value}): "
+                             f"{[a.agent_type.value for a in wave]}")
+
+            # Run the wave concurrently
+            wave_results = await asyncio.gather(
+                *[agent.run_async(context) for agent in wave],
+                return_exceptions=True
+            )
+
+            for agent, result in zip(wave, wave_results):
+                if isinstance(result, BaseException):
+                    result = {
+                        'agent_type': agent.agent_type.value,
+                        'status': AgentStatus.FAILED.value,
+                        'error': str(result)
+                    }
+
+                # Store result
+                self.results[agent.agent_type.value] = result
+                self.execution_order.append(agent.agent_type.value)
+
+                # Check if agent failed critically
+                if result.get('status') == AgentStatus.FAILED.value:
+                    critical_failure = result.get('critical_failure', False)
+                    if critical_failure:
+                        self.log("ERROR", f"Critical failure in {agent.agent_type.value} agent, stopping orchestration")
+                        stop_orchestration = True
+
+                # No-op short-circuit: if triage says the incident needs no
+                # action, the remaining waves (Bedrock calls, DynamoDB
+                # writes, notifications) are wasted work
+                if agent.agent_type == AgentType.TRIAGE and self._triage_says_noop(agent, result):
+                    self.log("INFO", "Triage classified incident as no-op, skipping remaining agents")
+                    noop = True
+                    stop_orchestration = True
+
+            if stop_orchestration:
+                break
+
+        # Record skipped entries for agents that never ran
+        if noop:
+            for agent in agents:
+                if agent.agent_type.value not in self.results:
+                    self.results[agent.agent_type.value] = {
+                        'agent_type': agent.agent_type.value,
+                        'status': AgentStatus.SKIPPED.value,
+                        'reason': 'triage_noop'
+                    }
+
         return {
             'correlation_id': self.correlation_id,
             'execution_order': self.execution_order,
             'agent_results': self.results,
             'total_agents': len(agents),
             'successful_agents': sum(1 for r in self.results.values() if r.get('status') == AgentStatus.SUCCESS.value),
-            'failed_agents': sum(1 for r in self.results.values() if r.get('status') == AgentStatus.FAILED.value)
+            'failed_agents': sum(1 for r in self.results.values() if r.get('status') == AgentStatus.FAILED.value),
+            'noop': noop
         }
-    
+
+    def _triage_says_noop(self, agent: 'BaseAgent', result: Dict[str, Any]) -> bool:
+        """
+        Check whether a successful triage result marks the incident a no-op
+
+        The severity floor defaults to INFO/LOW and can be tuned per
+        deployment via config['skip_below'].
+        """
+        if result.get('status') != AgentStatus.SUCCESS.value:
+            return False
+        analysis = result.get('analysis') or {}
+        if analysis.get('actionable') is False:
+            return True
+        skip_below = agent.config.get('skip_below', ('INFO', 'LOW'))
+        return analysis.get('classification') in skip_below
+
     def log(self, level: str, message: str, **kwargs):
         """Structured logging"""
         log_entry = {
-            'timestamp': datetime.utcnow().isoformat(),
+            'timestamp': iso_timestamp(),
             'level': level,
             'component': 'AgentCoordinator',
             'correlation_id': self.correlation_id,
             'message': message,
             **kwargs
         }
-        print(json.dumps(log_entry))
+        buffer_log(log_entry)
 
 
 # Global registry instance
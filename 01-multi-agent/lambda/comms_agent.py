@@ -3,12 +3,38 @@ Communications Agent - Human-Readable Updates and Notifications
 Sends emails, creates incident summaries, generates postmortems
 """
 
-import json
+import time
 from typing import Dict, List, Any
-from datetime import datetime
-from agent_framework import BaseAgent, AgentType, AgentPriority, agent_registry
+from agent_framework import (
+    BaseAgent, AgentType, AgentPriority, agent_registry, BOTO_CONFIG, buffer_log,
+    iso_timestamp, json_dumps
+)
 import boto3
 
+# Email body template, parsed once at import - the box rule and static
+# footer are ~70 lines of text the old f-string re-scanned per send
+_EMAIL_RULE = '\u2501' * 68
+_EMAIL_BODY_TEMPLATE = """
+%(summary)s
+
+""" + _EMAIL_RULE + """
+
+**INCIDENT ID:** %(incident_id)s
+
+**TIMESTAMP:** %(timestamp)s
+
+""" + _EMAIL_RULE + """
+
+This is an automated notification from the AIOps DevOps Agent.
+Full incident details are stored in DynamoDB.
+
+To approve pending remediation actions, reply to this email with "APPROVE %(short_id)s"
+"""
+
+# Module-scoped clients reused across warm invocations
+_SES = boto3.client('ses', config=BOTO_CONFIG)
+_SNS = boto3.client('sns', config=BOTO_CONFIG)
+
 
 @agent_registry.register
 class CommunicationsAgent(BaseAgent):
@@ -23,19 +49,14 @@ class CommunicationsAgent(BaseAgent):
     - Track notification preferences
     """
     
+    agent_type = AgentType.COMMUNICATIONS
+    priority = AgentPriority.LOW  # Communications runs last
+
     def __init__(self, correlation_id: str, config: Dict[str, Any] = None):
         super().__init__(correlation_id, config)
-        self.ses = boto3.client('ses')
-        self.sns = boto3.client('sns')
-    
-    @property
-    def agent_type(self) -> AgentType:
-        return AgentType.COMMUNICATIONS
-    
-    @property
-    def priority(self) -> AgentPriority:
-        return AgentPriority.LOW  # Communications runs last
-    
+        self.ses = _SES
+        self.sns = _SNS
+
     def analyze(self, context: Dict[str, Any]) -> Dict[str, Any]:
         """
         Analyze and prepare communications
@@ -152,7 +173,7 @@ INCIDENT DETAILS:
 TRIAGE ANALYSIS:
 - Classification: {triage.get('classification', 'Unknown')}
 - Severity: {triage.get('severity_score', 0)}/10
-- Business Impact: {json.dumps(triage.get('business_impact', {}))}
+- Business Impact: {json_dumps(triage.get('business_impact', {}))}
 
 TELEMETRY:
 - Anomalies Detected: {len(telemetry.get('anomalies', []))}
@@ -236,23 +257,13 @@ Automated remediation in progress.
             # Format email subject
             subject = f"🚨 AIOps Alert [{severity.upper()}] - Incident {self.correlation_id[:8]}"
             
-            # Format email body
-            body = f"""
-{summary}
-
-━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
-
-**INCIDENT ID:** {self.correlation_id}
-
-**TIMESTAMP:** {datetime.utcnow().isoformat()}
-
-━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
-
-This is an automated notification from the AIOps DevOps Agent.
-Full incident details are stored in DynamoDB.
-
-To approve pending remediation actions, reply to this email with "APPROVE {self.correlation_id[:8]}"
-"""
+            # Format email body from the preparsed module template
+            body = _EMAIL_BODY_TEMPLATE % {
+                'summary': summary,
+                'incident_id': self.correlation_id,
+                'timestamp': iso_timestamp(),
+                'short_id': self.correlation_id[:8]
+            }
             
             # Send via SES
             response = self.ses.send_email(
@@ -338,10 +349,10 @@ To approve pending remediation actions, reply to this email with "APPROVE {self.
 INCIDENT ID: {incident_id}
 
 CONTEXT:
-{json.dumps(context, indent=2, default=str)}
+{json_dumps(context, default=str)}
 
 AGENT RESULTS:
-{json.dumps(previous_results, indent=2, default=str)}
+{json_dumps(previous_results, default=str)}
 
 Generate a postmortem in this format:
 
@@ -387,8 +398,8 @@ Be specific and actionable.
                 Key={'incident_id': {'S': incident_id}},
                 UpdateExpression='SET communication_log = :log, updated_at = :updated',
                 ExpressionAttributeValues={
-                    ':log': {'S': json.dumps(results)},
-                    ':updated': {'S': datetime.utcnow().isoformat()}
+                    ':log': {'S': json_dumps(results)},
+                    ':updated': {'S': iso_timestamp()}
                 }
             )
         except Exception as e:
@@ -400,20 +411,22 @@ Be specific and actionable.
             successful = sum(1 for r in results if r.get('status') == 'success')
             failed = sum(1 for r in results if r.get('status') == 'failed')
             
-            self.cloudwatch.put_metric_data(
-                Namespace='AIOps/Communications',
-                MetricData=[
-                    {
-                        'MetricName': 'NotificationsSent',
-                        'Value': successful,
-                        'Unit': 'Count'
-                    },
-                    {
-                        'MetricName': 'NotificationsFailed',
-                        'Value': failed,
-                        'Unit': 'Count'
-                    }
-                ]
-            )
+            # EMF document - rides the buffered log flush instead of a
+            # synchronous put_metric_data round trip
+            buffer_log({
+                '_aws': {
+                    'Timestamp': int(time.time() * 1000),
+                    'CloudWatchMetrics': [{
+                        'Namespace': 'AIOps/Communications',
+                        'Dimensions': [[]],
+                        'Metrics': [
+                            {'Name': 'NotificationsSent', 'Unit': 'Count'},
+                            {'Name': 'NotificationsFailed', 'Unit': 'Count'}
+                        ]
+                    }]
+                },
+                'NotificationsSent': successful,
+                'NotificationsFailed': failed
+            })
         except Exception as e:
             self.log("ERROR", f"Error publishing metrics: {e}")
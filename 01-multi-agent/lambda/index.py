@@ -3,23 +3,48 @@ Multi-Agent Orchestrator Lambda
 Main entry point for multi-agent AIOps system
 """
 
-import json
+import asyncio
+import gzip
 import os
-from datetime import datetime
-from typing import Dict, Any
+import time
+from typing import Dict
 
-# Import agent framework and all agents
-from agent_framework import AgentCoordinator, AgentType, agent_registry
-from triage_agent import TriageAgent
-from telemetry_agent import TelemetryAgent
-from remediation_agent import RemediationAgent
-from risk_agent import RiskAgent
-from comms_agent import CommunicationsAgent
+# Import agent framework; agent modules themselves are registered lazily
+# below so cold starts only pay import cost for agents that actually run
+from agent_framework import (
+    AgentCoordinator, AgentType, agent_registry, aio_client, BOTO_CONFIG,
+    buffer_log, flush_logs, iso_timestamp, json_dumps, json_loads,
+    TriageConfig, TelemetryConfig, RemediationConfig, RiskConfig, CommsConfig
+)
 
 import boto3
+from boto3.dynamodb.types import TypeSerializer
+
+# Lazy agent registrations - resolved by the registry on first use
+_AGENT_IMPORTS = {
+    AgentType.TRIAGE: 'triage_agent:TriageAgent',
+    AgentType.TELEMETRY: 'telemetry_agent:TelemetryAgent',
+    AgentType.REMEDIATION: 'remediation_agent:RemediationAgent',
+    AgentType.RISK: 'risk_agent:RiskAgent',
+    AgentType.COMMUNICATIONS: 'comms_agent:CommunicationsAgent',
+}
+
+for _agent_type, _ref in _AGENT_IMPORTS.items():
+    agent_registry.register_lazy(_agent_type, _ref)
+
+# aioboto3 is optional in the Lambda layer - fall back to sync boto3 in a
+# worker thread when it is not available
+try:
+    import aioboto3
+except ImportError:
+    aioboto3 = None
+
+_aio_session = aioboto3.Session() if aioboto3 else None
 
 # AWS clients
-dynamodb = boto3.client('dynamodb')
+dynamodb = boto3.client('dynamodb', config=BOTO_CONFIG)
+
+_TS = TypeSerializer()
 
 # Environment variables
 INCIDENT_TABLE = os.environ.get('INCIDENT_TABLE', 'aiops-incidents')
@@ -28,17 +53,50 @@ CODEBUILD_PROJECT = os.environ.get('CODEBUILD_PROJECT', 'aiops-devops-agent-appl
 DEFAULT_EMAIL = os.environ.get('DEFAULT_EMAIL', 'devops@example.com')
 SENDER_EMAIL = os.environ.get('SENDER_EMAIL', 'noreply@example.com')
 
+# Full event/result payloads in logs are a multi-KB JSON encode per line
+# on large CloudTrail events - only emit them when debugging
+DEBUG_LOGGING = os.environ.get('DEBUG_LOGGING', 'false').lower() == 'true'
+
+# Agent configs are fully determined by environment variables, so the
+# frozen dataclass instances are built once per container instead of a
+# nested dict per invocation
+AGENT_CONFIG = {
+    AgentType.TRIAGE: TriageConfig(
+        incident_table=INCIDENT_TABLE,
+        # Classifications at or below this set short-circuit the
+        # remaining agents (see AgentCoordinator._triage_says_noop)
+        skip_below=('INFO', 'LOW')
+    ),
+    AgentType.TELEMETRY: TelemetryConfig(incident_table=INCIDENT_TABLE),
+    AgentType.REMEDIATION: RemediationConfig(
+        incident_table=INCIDENT_TABLE,
+        codebuild_project=CODEBUILD_PROJECT
+    ),
+    AgentType.RISK: RiskConfig(
+        incident_table=INCIDENT_TABLE,
+        blocked_windows=(
+            {'day': 4, 'start_hour': 16, 'end_hour': 23},  # Friday 4pm-11pm
+        )
+    ),
+    AgentType.COMMUNICATIONS: CommsConfig(
+        incident_table=INCIDENT_TABLE,
+        default_email=DEFAULT_EMAIL,
+        sender_email=SENDER_EMAIL,
+        sns_topic_arn=SNS_TOPIC_ARN
+    )
+}
+
 
 def structured_log(level: str, message: str, correlation_id: str = None, **kwargs):
     """Structured logging"""
     log_entry = {
-        'timestamp': datetime.utcnow().isoformat(),
+        'timestamp': iso_timestamp(),
         'level': level,
         'message': message,
         'correlation_id': correlation_id,
         **kwargs
     }
-    print(json.dumps(log_entry, default=str))
+    buffer_log(log_entry)
 
 
 def generate_correlation_id() -> str:
@@ -47,69 +105,194 @@ def generate_correlation_id() -> str:
     return f"incident-{uuid.uuid4()}"
 
 
+# Precompiled dispatch tables for resource detection - O(1) dict lookups
+# instead of a linear if/elif chain of substring and list-membership scans
+_EVENT_NAME_TO_TYPE = {
+    'TerminateInstances': 'ec2',
+    'StopInstances': 'ec2',
+    'DeleteFunction': 'lambda',
+    'DeleteTable': 'dynamodb',
+    'DeleteBucket': 's3',
+    'DeleteDBInstance': 'rds',
+}
+
+# CloudTrail eventSource is '<service>.amazonaws.com'
+_SOURCE_SERVICE_TO_TYPE = {
+    'ec2': 'ec2',
+    'lambda': 'lambda',
+    'dynamodb': 'dynamodb',
+    's3': 's3',
+    'rds': 'rds',
+    'ssm': 'ssm',
+}
+
+_RESOURCE_ID_EXTRACTORS = {
+    'ec2': lambda rp: rp.get('instancesSet', {}).get('items', [{}])[0].get('instanceId', 'unknown'),
+    'lambda': lambda rp: rp.get('functionName', 'unknown'),
+    'dynamodb': lambda rp: rp.get('tableName', 'unknown'),
+    's3': lambda rp: rp.get('bucketName', 'unknown'),
+    'rds': lambda rp: rp.get('dBInstanceIdentifier', 'unknown'),
+    'ssm': lambda rp: rp.get('name', 'unknown'),
+}
+
+
 def detect_resource_type(event_detail: Dict) -> str:
     """Detect resource type from event"""
     event_name = event_detail.get('eventName', '')
     event_source = event_detail.get('eventSource', '')
-    
-    if 'ec2' in event_source or event_name in ['TerminateInstances', 'StopInstances']:
-        return 'ec2'
-    elif 'lambda' in event_source or event_name in ['DeleteFunction']:
-        return 'lambda'
-    elif 'dynamodb' in event_source or event_name in ['DeleteTable']:
-        return 'dynamodb'
-    elif 's3' in event_source or event_name in ['DeleteBucket']:
-        return 's3'
-    elif 'rds' in event_source or event_name in ['DeleteDBInstance']:
-        return 'rds'
-    elif 'ssm' in event_source:
-        return 'ssm'
-    
-    return 'unknown'
+
+    resource_type = _EVENT_NAME_TO_TYPE.get(event_name)
+    if resource_type:
+        return resource_type
+
+    return _SOURCE_SERVICE_TO_TYPE.get(event_source.split('.', 1)[0], 'unknown')
 
 
 def extract_resource_identifier(event_detail: Dict, resource_type: str) -> str:
     """Extract resource ID from event"""
     request_params = event_detail.get('requestParameters', {})
-    
-    if resource_type == 'ec2':
-        instances = request_params.get('instancesSet', {}).get('items', [])
-        if instances:
-            return instances[0].get('instanceId', 'unknown')
-    elif resource_type == 'lambda':
-        return request_params.get('functionName', 'unknown')
-    elif resource_type == 'dynamodb':
-        return request_params.get('tableName', 'unknown')
-    elif resource_type == 's3':
-        return request_params.get('bucketName', 'unknown')
-    elif resource_type == 'rds':
-        return request_params.get('dBInstanceIdentifier', 'unknown')
-    elif resource_type == 'ssm':
-        return request_params.get('name', 'unknown')
-    
-    return 'unknown'
+
+    extractor = _RESOURCE_ID_EXTRACTORS.get(resource_type)
+    if extractor is None:
+        return 'unknown'
+
+    try:
+        return extractor(request_params) or 'unknown'
+    except (AttributeError, IndexError, TypeError):
+        return 'unknown'
+
+
+def _build_incident_item(correlation_id: str, context: Dict, initial_state: str = 'DETECTING') -> Dict:
+    """Build the initial DynamoDB incident item"""
+    timestamp = iso_timestamp()
+
+    # Store event_details as a native Map so consumers read attributes
+    # directly instead of re-parsing an escaped JSON string; fall back to
+    # the string encoding for values TypeSerializer can't represent
+    try:
+        event_details = _TS.serialize(context['event_details'])
+    except TypeError:
+        event_details = {'S': json_dumps(context['event_details'], default=str)}
+
+    return {
+        'incident_id': {'S': correlation_id},
+        'incident_timestamp': {'S': timestamp},
+        'incident_day': {'S': timestamp[:10]},
+        'resource_type': {'S': context['resource_type']},
+        'resource_id': {'S': context['resource_id']},
+        'resource_key': {'S': f"{context['resource_type']}#{context['resource_id']}"},
+        'workflow_state': {'S': initial_state},
+        'event_details': event_details,
+        'created_at': {'S': timestamp},
+        'updated_at': {'S': timestamp}
+    }
+
+
+# Precompiled UpdateExpression templates for the key-sets the workflow
+# actually writes, keyed by frozenset(data.keys()) - skips the per-call
+# string concatenation loop for the common transitions. Each entry is
+# (update_expression, expression_attribute_names or None).
+_UPDATE_TEMPLATES = {
+    frozenset(): (
+        "SET workflow_state = :state, updated_at = :updated",
+        None
+    ),
+    frozenset({'agent_results', 'total_duration_seconds'}): (
+        "SET workflow_state = :state, updated_at = :updated, "
+        "agent_results = :agent_results, total_duration_seconds = :total_duration_seconds",
+        None
+    ),
+    frozenset({'error'}): (
+        # 'error' is a reserved keyword in DynamoDB
+        "SET workflow_state = :state, updated_at = :updated, #err = :error",
+        {'#err': 'error'}
+    ),
+}
 
 
-def create_incident_record(correlation_id: str, context: Dict) -> bool:
+# Exact-type dispatch for attribute encoding - one dict lookup instead
+# of an isinstance cascade per attribute. bool precedes int naturally
+# here because the table is keyed on the concrete type.
+_ATTR_ENCODERS = {
+    bytes: lambda v: {'B': v},
+    bytearray: lambda v: {'B': v},
+    bool: lambda v: {'BOOL': v},
+    int: lambda v: {'N': str(v)},
+    float: lambda v: {'N': str(v)},
+    str: lambda v: {'S': v},
+}
+
+
+def _encode_attr(value) -> Dict:
+    """Encode a Python value as a DynamoDB attribute value"""
+    encoder = _ATTR_ENCODERS.get(type(value))
+    if encoder is not None:
+        return encoder(value)
+    return {'S': str(value)}
+
+
+def _build_update_args(incident_id: str, state: str, data: Dict = None) -> Dict:
+    """Build UpdateItem arguments for a workflow state transition"""
+    expr_values = {
+        ':state': {'S': state},
+        ':updated': {'S': iso_timestamp()}
+    }
+
+    template = _UPDATE_TEMPLATES.get(frozenset(data) if data else frozenset())
+    if template is not None:
+        update_expr, expr_names = template
+        if data:
+            for key, value in data.items():
+                expr_values[f':{key}'] = _encode_attr(value)
+    else:
+        # Unknown key-set - build the expression the slow way
+        update_expr = "SET workflow_state = :state, updated_at = :updated"
+        expr_names = {}
+        for key, value in data.items():
+            if key == 'error':
+                update_expr += ", #err = :error"
+                expr_names['#err'] = 'error'
+                expr_values[':error'] = {'S': str(value)}
+            else:
+                update_expr += f", {key} = :{key}"
+                expr_values[f':{key}'] = _encode_attr(value)
+
+    update_args = {
+        'TableName': INCIDENT_TABLE,
+        'Key': {'incident_id': {'S': incident_id}},
+        'UpdateExpression': update_expr,
+        'ExpressionAttributeValues': expr_values
+    }
+
+    if expr_names:
+        update_args['ExpressionAttributeNames'] = expr_names
+
+    return update_args
+
+
+def create_incident_record(correlation_id: str, context: Dict, initial_state: str = 'DETECTING') -> bool:
     """Create initial incident record in DynamoDB"""
     try:
-        timestamp = datetime.utcnow().isoformat()
-        
-        item = {
-            'incident_id': {'S': correlation_id},
-            'incident_timestamp': {'S': timestamp},
-            'resource_type': {'S': context['resource_type']},
-            'resource_id': {'S': context['resource_id']},
-            'resource_key': {'S': f"{context['resource_type']}#{context['resource_id']}"},
-            'workflow_state': {'S': 'DETECTING'},
-            'event_details': {'S': json.dumps(context['event_details'], default=str)},
-            'created_at': {'S': timestamp},
-            'updated_at': {'S': timestamp}
-        }
-        
+        item = _build_incident_item(correlation_id, context, initial_state)
         dynamodb.put_item(TableName=INCIDENT_TABLE, Item=item)
         return True
-        
+
+    except Exception as e:
+        structured_log("ERROR", f"Error creating incident record: {e}", correlation_id)
+        return False
+
+
+async def create_incident_record_async(correlation_id: str, context: Dict, initial_state: str = 'DETECTING') -> bool:
+    """Async variant of create_incident_record (aioboto3 when available)"""
+    if _aio_session is None:
+        return await asyncio.to_thread(create_incident_record, correlation_id, context, initial_state)
+
+    try:
+        item = _build_incident_item(correlation_id, context, initial_state)
+        client = await aio_client('dynamodb')
+        await client.put_item(TableName=INCIDENT_TABLE, Item=item)
+        return True
+
     except Exception as e:
         structured_log("ERROR", f"Error creating incident record: {e}", correlation_id)
         return False
@@ -118,59 +301,118 @@ def create_incident_record(correlation_id: str, context: Dict) -> bool:
 def update_workflow_state(incident_id: str, state: str, data: Dict = None) -> bool:
     """Update workflow state in DynamoDB"""
     try:
-        update_expr = "SET workflow_state = :state, updated_at = :updated"
-        expr_values = {
-            ':state': {'S': state},
-            ':updated': {'S': datetime.utcnow().isoformat()}
-        }
-        expr_names = {}
-        
-        if data:
-            for key, value in data.items():
-                if key == 'error':
-                    # 'error' is a reserved keyword in DynamoDB
-                    update_expr += ", #err = :error"
-                    expr_names['#err'] = 'error'
-                    expr_values[':error'] = {'S': str(value)}
-                else:
-                    update_expr += f", {key} = :{key}"
-                    if isinstance(value, bool):
-                        expr_values[f':{key}'] = {'BOOL': value}
-                    elif isinstance(value, (int, float)):
-                        expr_values[f':{key}'] = {'N': str(value)}
-                    else:
-                        expr_values[f':{key}'] = {'S': str(value)}
-        
-        update_args = {
-            'TableName': INCIDENT_TABLE,
-            'Key': {'incident_id': {'S': incident_id}},
-            'UpdateExpression': update_expr,
-            'ExpressionAttributeValues': expr_values
-        }
-        
-        if expr_names:
-            update_args['ExpressionAttributeNames'] = expr_names
-            
-        dynamodb.update_item(**update_args)
+        dynamodb.update_item(**_build_update_args(incident_id, state, data))
         return True
-        
+
     except Exception as e:
         structured_log("ERROR", f"Error updating workflow state: {e}", incident_id)
         return False
 
 
+async def update_workflow_state_async(incident_id: str, state: str, data: Dict = None) -> bool:
+    """Async variant of update_workflow_state (aioboto3 when available)"""
+    if _aio_session is None:
+        return await asyncio.to_thread(update_workflow_state, incident_id, state, data)
+
+    try:
+        client = await aio_client('dynamodb')
+        await client.update_item(**_build_update_args(incident_id, state, data))
+        return True
+
+    except Exception as e:
+        structured_log("ERROR", f"Error updating workflow state: {e}", incident_id)
+        return False
+
+
+async def _process_incident(
+    coordinator: AgentCoordinator,
+    correlation_id: str,
+    incident_context: Dict,
+    agent_types: list,
+    agent_config: Dict,
+    start_time: float
+) -> Dict:
+    """Run the async incident workflow: record, orchestrate, persist results"""
+    # The ANALYZING record is advisory (observability only), so issue the
+    # write concurrently with the first agent wave instead of ahead of it -
+    # this takes one DynamoDB round trip off the critical path
+    record_task = asyncio.create_task(
+        create_incident_record_async(correlation_id, incident_context, initial_state='ANALYZING')
+    )
+
+    try:
+        results = await coordinator.orchestrate(
+            context=incident_context,
+            agent_types=agent_types,
+            config=agent_config
+        )
+    finally:
+        # Await before returning so Lambda doesn't freeze the sandbox
+        # mid-write
+        await record_task
+
+    structured_log(
+        "INFO", "Agent orchestration complete", correlation_id,
+        successful_agents=results['successful_agents'],
+        failed_agents=results['failed_agents'],
+        execution_order=results['execution_order']
+    )
+    if DEBUG_LOGGING:
+        structured_log("DEBUG", "Agent results", correlation_id, results=results)
+
+    # Update final workflow state
+    if results.get('noop'):
+        final_state = 'COMPLETED_NOOP'
+    elif results['successful_agents'] == results['total_agents']:
+        final_state = 'COMPLETED'
+    else:
+        final_state = 'FAILED'
+    # Agent results are 5-30KB of highly compressible JSON - store them
+    # gzipped in a Binary attribute to cut the write (and WCU cost) 5-10x
+    results_payload = gzip.compress(
+        json_dumps(results, default=str).encode('utf-8'), compresslevel=3
+    )
+    await update_workflow_state_async(
+        correlation_id,
+        final_state,
+        {
+            'agent_results': results_payload,
+            'total_duration_seconds': time.monotonic() - start_time
+        }
+    )
+
+    return results
+
+
 def handler(event, context):
     """
     Main Lambda handler for multi-agent orchestration
     """
-    start_time = datetime.utcnow()
+    try:
+        return _handle(event, context)
+    finally:
+        # Emit all buffered log lines in one stdout write instead of one
+        # flush per log call
+        flush_logs()
+
+
+def _handle(event, context):
+    """Handler body - logs are flushed by the wrapper on every exit path"""
+    start_time = time.monotonic()
     correlation_id = generate_correlation_id()
     
-    structured_log("INFO", "Multi-agent orchestrator invoked", correlation_id, event=event)
-    
     # Parse event
     detail_type = event.get('detail-type', '')
     detail = event.get('detail', {})
+
+    structured_log(
+        "INFO", "Multi-agent orchestrator invoked", correlation_id,
+        detail_type=detail_type,
+        event_name=detail.get('eventName'),
+        source=event.get('source')
+    )
+    if DEBUG_LOGGING:
+        structured_log("DEBUG", "Inbound event", correlation_id, event=event)
     
     # Detect resource type and ID
     if detail_type == 'EC2 Instance State-change Notification':
@@ -185,7 +427,7 @@ def handler(event, context):
         resource_id = extract_resource_identifier(detail, resource_type)
     elif detail_type == 'Regional Event':
         # Handle forwarded events from satellite regions
-        nested_detail = json.loads(event.get('Detail', '{}'))
+        nested_detail = json_loads(event.get('Detail', '{}'))
         event_name = nested_detail.get('eventName', 'RegionalEvent')
         resource_type = detect_resource_type(nested_detail)
         resource_id = extract_resource_identifier(nested_detail, resource_type)
@@ -201,7 +443,17 @@ def handler(event, context):
     else:
         structured_log("WARN", f"Unknown event type: {detail_type}", correlation_id)
         return {"status": "ignored", "reason": "unknown_event_type"}
-    
+
+    # Bail before the incident record, Bedrock calls and agent writes
+    # when the event targets a resource type no agent can act on -
+    # noise events cost one buffered log line instead of a workflow
+    if resource_type == 'unknown':
+        structured_log(
+            "INFO", "Ignoring event for unsupported resource type", correlation_id,
+            event_name=event_name
+        )
+        return {"status": "ignored", "reason": "unsupported_resource_type"}
+
     # Extract regional context
     region = event.get('region', os.environ.get('AWS_REGION', 'us-east-1'))
     regional_context = event.get('regional_context', {})
@@ -216,36 +468,7 @@ def handler(event, context):
         'regional_context': regional_context,
         'user_identity': user_identity,
         'event_details': detail,
-        'event_time': detail.get('eventTime', datetime.utcnow().isoformat())
-    }
-    
-    # Create incident record
-    create_incident_record(correlation_id, incident_context)
-    
-    # Configure agents
-    agent_config = {
-        AgentType.TRIAGE: {
-            'incident_table': INCIDENT_TABLE
-        },
-        AgentType.TELEMETRY: {
-            'incident_table': INCIDENT_TABLE
-        },
-        AgentType.REMEDIATION: {
-            'incident_table': INCIDENT_TABLE,
-            'codebuild_project': CODEBUILD_PROJECT
-        },
-        AgentType.RISK: {
-            'incident_table': INCIDENT_TABLE,
-            'blocked_windows': [
-                {'day': 4, 'start_hour': 16, 'end_hour': 23}  # Friday 4pm-11pm
-            ]
-        },
-        AgentType.COMMUNICATIONS: {
-            'incident_table': INCIDENT_TABLE,
-            'default_email': DEFAULT_EMAIL,
-            'sender_email': SENDER_EMAIL,
-            'sns_topic_arn': SNS_TOPIC_ARN
-        }
+        'event_time': detail.get('eventTime', iso_timestamp())
     }
     
     # Create coordinator
@@ -260,34 +483,21 @@ def handler(event, context):
         AgentType.COMMUNICATIONS # Priority: LOW
     ]
     
-    # Update workflow state
-    update_workflow_state(correlation_id, 'ANALYZING')
-    
     # Orchestrate agents
     try:
-        results = coordinator.orchestrate(
-            context=incident_context,
-            agent_types=agent_types,
-            config=agent_config
-        )
-        
-        structured_log("INFO", "Agent orchestration complete", correlation_id, results=results)
-        
-        # Update final workflow state
-        final_state = 'COMPLETED' if results['successful_agents'] == results['total_agents'] else 'FAILED'
-        update_workflow_state(
+        results = asyncio.run(_process_incident(
+            coordinator,
             correlation_id,
-            final_state,
-            {
-                'agent_results': json.dumps(results, default=str),
-                'total_duration_seconds': (datetime.utcnow() - start_time).total_seconds()
-            }
-        )
-        
+            incident_context,
+            agent_types,
+            AGENT_CONFIG,
+            start_time
+        ))
+
         return {
             'status': 'success',
             'correlation_id': correlation_id,
-            'results': json.loads(json.dumps(results, default=str))
+            'results': json_loads(json_dumps(results, default=str))
         }
         
     except Exception as e:
@@ -3,11 +3,14 @@ Telemetry Agent - Deep Query of Metrics, Logs, and Traces
 Queries CloudWatch Metrics/Logs, X-Ray, Application Signals
 """
 
-import json
 import os
+import time
 from typing import Dict, List, Any, Optional
 from datetime import datetime, timedelta
-from agent_framework import BaseAgent, AgentType, AgentPriority, agent_registry
+from agent_framework import (
+    BaseAgent, AgentType, AgentPriority, agent_registry, buffer_log,
+    iso_timestamp, json_dumps
+)
 import boto3
 
 
@@ -24,25 +27,20 @@ class TelemetryAgent(BaseAgent):
     - Anomaly detection in metrics
     """
     
+    agent_type = AgentType.TELEMETRY
+    priority = AgentPriority.HIGH  # Telemetry runs after triage
+
     def __init__(self, correlation_id: str, config: Dict[str, Any] = None):
         super().__init__(correlation_id, config)
-        
+
         # Determine region to query
         self.target_region = config.get('region', os.environ.get('AWS_REGION', 'us-east-1'))
-        
+
         # Initialize clients for target region
         self.cloudwatch = boto3.client('cloudwatch', region_name=self.target_region)
         self.logs_client = boto3.client('logs', region_name=self.target_region)
         self.xray = boto3.client('xray', region_name=self.target_region)
-    
-    @property
-    def agent_type(self) -> AgentType:
-        return AgentType.TELEMETRY
-    
-    @property
-    def priority(self) -> AgentPriority:
-        return AgentPriority.HIGH  # Telemetry runs after triage
-    
+
     def analyze(self, context: Dict[str, Any]) -> Dict[str, Any]:
         """
         Analyze telemetry data for the incident
@@ -396,30 +394,35 @@ class TelemetryAgent(BaseAgent):
                 Key={'incident_id': {'S': incident_id}},
                 UpdateExpression='SET telemetry_results = :results, updated_at = :updated',
                 ExpressionAttributeValues={
-                    ':results': {'S': json.dumps(analysis, default=str)},
-                    ':updated': {'S': datetime.utcnow().isoformat()}
+                    ':results': {'S': json_dumps(analysis, default=str)},
+                    ':updated': {'S': iso_timestamp()}
                 }
             )
         except Exception as e:
             self.log("ERROR", f"Error storing telemetry results: {e}")
     
     def _publish_telemetry_metrics(self, analysis: Dict[str, Any]):
-        """Publish telemetry metrics to CloudWatch"""
+        """
+        Publish telemetry metrics via CloudWatch embedded metric format
+
+        The EMF document rides the buffered log flush, so metric
+        publication costs no put_metric_data round trip.
+        """
         try:
-            self.cloudwatch.put_metric_data(
-                Namespace='AIOps/Telemetry',
-                MetricData=[
-                    {
-                        'MetricName': 'AnomaliesDetected',
-                        'Value': len(analysis['anomalies']),
-                        'Unit': 'Count'
-                    },
-                    {
-                        'MetricName': 'HealthScore',
-                        'Value': analysis['telemetry_health_score'],
-                        'Unit': 'None'
-                    }
-                ]
-            )
+            buffer_log({
+                '_aws': {
+                    'Timestamp': int(time.time() * 1000),
+                    'CloudWatchMetrics': [{
+                        'Namespace': 'AIOps/Telemetry',
+                        'Dimensions': [[]],
+                        'Metrics': [
+                            {'Name': 'AnomaliesDetected', 'Unit': 'Count'},
+                            {'Name': 'HealthScore', 'Unit': 'None'}
+                        ]
+                    }]
+                },
+                'AnomaliesDetected': len(analysis['anomalies']),
+                'HealthScore': analysis['telemetry_health_score']
+            })
         except Exception as e:
             self.log("ERROR", f"Error publishing metrics: {e}")
@@ -3,11 +3,22 @@ Triage Agent - Alert Classification, Deduplication, and Prioritization
 Analyzes CloudWatch alarms, DevOps Guru events, and historical patterns
 """
 
-import json
 import hashlib
+import time
 from typing import Dict, List, Any
 from datetime import datetime, timedelta
-from agent_framework import BaseAgent, AgentType, AgentPriority, agent_registry
+from agent_framework import (
+    BaseAgent, AgentType, AgentPriority, agent_registry, buffer_log,
+    extract_json_fragment, iso_timestamp, json_dumps, json_loads
+)
+
+# Warm-container TTL cache for the duplicate lookup, keyed by
+# fingerprint. Incidents cluster - the same resource flapping fires the
+# same fingerprint repeatedly - and each repeat within the TTL skips a
+# DynamoDB scan. 60s keeps the staleness window small enough that a
+# genuinely new duplicate still surfaces on the next incident.
+_DUPLICATE_CACHE: Dict[str, tuple] = {}
+_DUPLICATE_TTL_SECONDS = 60
 
 
 @agent_registry.register
@@ -22,14 +33,9 @@ class TriageAgent(BaseAgent):
     - Noise reduction using ML-based filtering
     """
     
-    @property
-    def agent_type(self) -> AgentType:
-        return AgentType.TRIAGE
-    
-    @property
-    def priority(self) -> AgentPriority:
-        return AgentPriority.CRITICAL  # Triage runs first
-    
+    agent_type = AgentType.TRIAGE
+    priority = AgentPriority.CRITICAL  # Triage runs first
+
     def analyze(self, context: Dict[str, Any]) -> Dict[str, Any]:
         """
         Analyze and classify the incident
@@ -131,10 +137,24 @@ class TriageAgent(BaseAgent):
     def _check_duplicates(self, fingerprint: str, resource_type: str) -> tuple[bool, List[Dict]]:
         """
         Check for duplicate incidents in the last 24 hours
-        
+
+        Cached in-process per fingerprint for a short TTL - see
+        _DUPLICATE_CACHE above.
+
         Returns:
             (is_duplicate, similar_incidents)
         """
+        now = time.monotonic()
+        cached = _DUPLICATE_CACHE.get(fingerprint)
+        if cached is not None and now - cached[0] < _DUPLICATE_TTL_SECONDS:
+            return cached[1]
+
+        result = self._fetch_duplicates(fingerprint)
+        _DUPLICATE_CACHE[fingerprint] = (now, result)
+        return result
+
+    def _fetch_duplicates(self, fingerprint: str) -> tuple[bool, List[Dict]]:
+        """Scan DynamoDB for incidents sharing the fingerprint"""
         try:
             cutoff_time = (datetime.utcnow() - timedelta(hours=24)).isoformat()
             
@@ -318,15 +338,13 @@ Respond in JSON format:
 """
         
         try:
-            response = self.invoke_bedrock(prompt, max_tokens=512)
-            
-            # Parse JSON response
-            if '```json' in response:
-                response = response.split('```json')[1].split('```')[0].strip()
-            elif '```' in response:
-                response = response.split('```')[1].split('```')[0].strip()
+            # The response is a single JSON object, so stream and stop at
+            # its closing brace instead of waiting for generation to finish
+            response = self.invoke_bedrock(prompt, max_tokens=512, stop_on_json=True)
             
-            impact = json.loads(response)
+            # Pull the JSON object straight out of the response - no
+            # fence-stripping heuristics, prose around the object is fine
+            impact = json_loads(extract_json_fragment(response))
             return impact
             
         except Exception as e:
@@ -348,9 +366,9 @@ Respond in JSON format:
                 Key={'incident_id': {'S': incident_id}},
                 UpdateExpression='SET triage_results = :results, fingerprint = :fp, updated_at = :updated',
                 ExpressionAttributeValues={
-                    ':results': {'S': json.dumps(analysis)},
+                    ':results': {'S': json_dumps(analysis)},
                     ':fp': {'S': analysis['fingerprint']},
-                    ':updated': {'S': datetime.utcnow().isoformat()}
+                    ':updated': {'S': iso_timestamp()}
                 }
             )
         except Exception as e:
@@ -371,35 +389,42 @@ Respond in JSON format:
             self.log("ERROR", f"Error linking duplicate: {e}")
     
     def _publish_triage_metrics(self, analysis: Dict[str, Any]):
-        """Publish triage metrics to CloudWatch"""
+        """
+        Publish triage metrics via CloudWatch embedded metric format
+
+        The EMF document rides the buffered log flush, so metric
+        publication costs no put_metric_data round trip.
+        """
         try:
-            self.cloudwatch.put_metric_data(
-                Namespace='AIOps/Triage',
-                MetricData=[
-                    {
-                        'MetricName': 'IncidentClassification',
-                        'Value': 1,
-                        'Unit': 'Count',
-                        'Dimensions': [
-                            {'Name': 'Classification', 'Value': analysis['classification']}
-                        ]
-                    },
-                    {
-                        'MetricName': 'SeverityScore',
-                        'Value': analysis['severity_score'],
-                        'Unit': 'None'
-                    },
-                    {
-                        'MetricName': 'NoiseScore',
-                        'Value': analysis['noise_score'],
-                        'Unit': 'None'
-                    },
-                    {
-                        'MetricName': 'DuplicateIncidents',
-                        'Value': 1 if analysis['is_duplicate'] else 0,
-                        'Unit': 'Count'
-                    }
-                ]
-            )
+            buffer_log({
+                '_aws': {
+                    'Timestamp': int(time.time() * 1000),
+                    'CloudWatchMetrics': [
+                        {
+                            'Namespace': 'AIOps/Triage',
+                            'Dimensions': [['Classification']],
+                            'Metrics': [
+                                {'Name': 'IncidentClassification', 'Unit': 'Count'}
+                            ]
+                        },
+                        # Scores stay undimensioned to keep the metric
+                        # identity the dashboards already query
+                        {
+                            'Namespace': 'AIOps/Triage',
+                            'Dimensions': [[]],
+                            'Metrics': [
+                                {'Name': 'SeverityScore', 'Unit': 'None'},
+                                {'Name': 'NoiseScore', 'Unit': 'None'},
+                                {'Name': 'DuplicateIncidents', 'Unit': 'Count'}
+                            ]
+                        }
+                    ]
+                },
+                'Classification': analysis['classification'],
+                'IncidentClassification': 1,
+                'SeverityScore': analysis['severity_score'],
+                'NoiseScore': analysis['noise_score'],
+                'DuplicateIncidents': 1 if analysis['is_duplicate'] else 0
+            })
         except Exception as e:
             self.log("ERROR", f"Error publishing metrics: {e}")
@@ -16,6 +16,18 @@ variable "incident_table_name" {
   default     = "aiops-incidents"
 }
 
+variable "llm_cache_table_name" {
+  description = "DynamoDB table name for cached Bedrock responses"
+  type        = string
+  default     = "aiops-llm-cache"
+}
+
+variable "runbook_cache_table_name" {
+  description = "DynamoDB table name for cached remediation runbooks"
+  type        = string
+  default     = "aiops-runbook-cache"
+}
+
 variable "sns_topic_arn" {
   description = "SNS topic ARN for notifications"
   type        = string
@@ -6,12 +6,23 @@ Routes events to local agents or central reasoning layer
 import json
 import os
 import boto3
+from botocore.config import Config
 from datetime import datetime
 from typing import Dict, Any
 
+# Pooled keep-alive connections survive across warm invocations, so
+# forwarding an event skips the per-call TLS handshake
+_CFG = Config(
+    retries={'total_max_attempts': 5, 'mode': 'adaptive'},
+    max_pool_connections=50,
+    tcp_keepalive=True,
+    connect_timeout=2,
+    read_timeout=30
+)
+
 # AWS clients
-events = boto3.client('events')
-lambda_client = boto3.client('lambda')
+events = boto3.client('events', config=_CFG)
+lambda_client = boto3.client('lambda', config=_CFG)
 
 # Environment variables
 CENTRAL_REGION = os.environ.get('CENTRAL_REGION', 'us-east-1')
@@ -96,7 +96,10 @@ resource "aws_iam_role_policy" "ml_lambda" {
           "dynamodb:Query",
           "dynamodb:GetItem"
         ]
-        Resource = "arn:aws:dynamodb:${var.aws_region}:*:table/${var.incident_table_name}"
+        Resource = [
+          "arn:aws:dynamodb:${var.aws_region}:*:table/${var.incident_table_name}",
+          "arn:aws:dynamodb:${var.aws_region}:*:table/${var.incident_table_name}/index/*"
+        ]
       },
       {
         Effect = "Allow"
@@ -3,30 +3,183 @@ Kubernetes Agent - EKS Event Detection and Pod Recovery
 Handles K8s pod failures, deployment rollbacks, and HPA integration
 """
 
+import asyncio
+import io
 import json
 import os
 import boto3
+from botocore.config import Config
 from typing import Dict, List, Any
-from datetime import datetime
-import base64
+
+# aioboto3 is optional in the Lambda layer - batch operations fall back
+# to fanning the sync client out across worker threads
+try:
+    import aioboto3
+except ImportError:
+    aioboto3 = None
+
+_aio_session = aioboto3.Session() if aioboto3 else None
+
+# orjson is optional in the Lambda layer - kubectl pod listings for a
+# busy namespace run to megabytes, where it decodes several times
+# faster than the stdlib
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
+
+# ijson is optional too - with it, large pod listings are walked one
+# pod at a time instead of being materialized as a full dict tree
+try:
+    import ijson
+except ImportError:
+    ijson = None
+
+# aiolimiter is optional - when present, concurrent remediation is
+# throttled to a steady rate instead of storming the control plane
+# during a large failure wave and eating 429 retry backoffs
+try:
+    from aiolimiter import AsyncLimiter
+except ImportError:
+    AsyncLimiter = None
+
+# Shared client tuning: pooled keep-alive connections avoid a TLS
+# handshake per kubectl invocation, and adaptive retries smooth
+# throttling when many pods are remediated at once
+_CFG = Config(
+    retries={'total_max_attempts': 6, 'mode': 'adaptive'},
+    max_pool_connections=50,
+    tcp_keepalive=True,
+    connect_timeout=2,
+    read_timeout=30
+)
+
+# Pod-failure classification sets: hashed membership instead of a
+# list scan per pod/container on large namespaces
+_BAD_PHASES = frozenset({'Failed', 'Unknown'})
+_BAD_WAIT_REASONS = frozenset({'CrashLoopBackOff', 'ImagePullBackOff', 'ErrImagePull'})
 
 # AWS clients
-eks = boto3.client('eks')
-ec2 = boto3.client('ec2')
-dynamodb = boto3.client('dynamodb')
-lambda_client = boto3.client('lambda')
+eks = boto3.client('eks', config=_CFG)
+lambda_client = boto3.client('lambda', config=_CFG)
 
 
 class KubernetesAgent:
     """
     Kubernetes agent for EKS monitoring and recovery
+
+    Instances are stateless beyond their construction arguments, so the
+    handler memoizes them per cluster across warm invocations.
     """
     
     def __init__(self, cluster_name: str, region: str = 'us-east-1'):
         self.cluster_name = cluster_name
         self.region = region
         self.kubectl_lambda = os.environ.get('KUBECTL_LAMBDA_ARN', '')
-    
+        # Token bucket shared by the async fan-out paths: 50
+        # invocations per second, burst included
+        self._limiter = AsyncLimiter(50, 1.0) if AsyncLimiter else None
+
+    def _invoke_kubectl(self, command: str, wait: bool = True) -> Dict:
+        """
+        Single kubectl-Lambda invocation
+
+        wait=False fires the command asynchronously (InvocationType
+        Event) and returns after the Lambda service ack - tens of
+        milliseconds instead of the 1-5s kubectl execution.
+        """
+        response = lambda_client.invoke(
+            FunctionName=self.kubectl_lambda,
+            InvocationType='RequestResponse' if wait else 'Event',
+            Payload=json.dumps({
+                'cluster': self.cluster_name,
+                'command': command
+            })
+        )
+        if not wait:
+            return {'status': 'accepted', 'invocation': 'event'}
+        return _json_loads(response['Payload'].read())
+
+    async def _invoke_kubectl_many(self, commands: List[str]) -> List[Dict]:
+        """
+        Fan kubectl-Lambda invocations out concurrently
+
+        With aioboto3 the round trips overlap on one event loop and a
+        single connection pool; without it the sync client is fanned out
+        across worker threads. Either way N commands cost roughly one
+        round trip of wall clock instead of N.
+        """
+        if _aio_session is None:
+
+            async def _one_sync(command: str) -> Dict:
+                if self._limiter is not None:
+                    async with self._limiter:
+                        return await asyncio.to_thread(self._invoke_kubectl, command)
+                return await asyncio.to_thread(self._invoke_kubectl, command)
+
+            return list(await asyncio.gather(*[_one_sync(c) for c in commands]))
+
+        async with _aio_session.client('lambda') as client:
+
+            async def _invoke(command: str) -> Dict:
+                response = await client.invoke(
+                    FunctionName=self.kubectl_lambda,
+                    Payload=json.dumps({
+                        'cluster': self.cluster_name,
+                        'command': command
+                    })
+                )
+                payload = await response['Payload'].read()
+                return _json_loads(payload)
+
+            async def _one(command: str) -> Dict:
+                if self._limiter is not None:
+                    async with self._limiter:
+                        return await _invoke(command)
+                return await _invoke(command)
+
+            return list(await asyncio.gather(*[_one(c) for c in commands]))
+
+    def bulk_exec(self, commands: List[str]) -> List[Dict]:
+        """
+        Execute many kubectl commands in one kubectl-Lambda invocation
+
+        The kubectl Lambda runs the whole list in a single kubeconfig
+        session, so N actions cost one Lambda round trip and one
+        credentials fetch instead of N of each.
+        """
+        response = lambda_client.invoke(
+            FunctionName=self.kubectl_lambda,
+            Payload=json.dumps({
+                'cluster': self.cluster_name,
+                'commands': commands
+            })
+        )
+        result = _json_loads(response['Payload'].read())
+        return _json_loads(result.get('body', '{}')).get('results', [])
+
+    def restart_pods(self, pod_names: List[str], namespace: str = 'default') -> List[Dict]:
+        """Restart a batch of failed pods concurrently"""
+        try:
+            asyncio.run(self._invoke_kubectl_many([
+                f'delete pod {pod_name} -n {namespace}' for pod_name in pod_names
+            ]))
+            return [
+                {
+                    'status': 'success',
+                    'pod': pod_name,
+                    'namespace': namespace,
+                    'action': 'deleted_for_restart'
+                }
+                for pod_name in pod_names
+            ]
+        except Exception as e:
+            return [{
+                'status': 'failed',
+                'error': str(e)
+            }]
+
     def detect_pod_failures(self, namespace: str = 'default') -> List[Dict]:
         """
         Detect failed pods in EKS cluster
@@ -34,72 +187,81 @@ class KubernetesAgent:
         """
         try:
             # Invoke kubectl Lambda to get pod status
-            response = lambda_client.invoke(
-                FunctionName=self.kubectl_lambda,
-                Payload=json.dumps({
-                    'cluster': self.cluster_name,
-                    'command': f'get pods -n {namespace} -o json'
-                })
-            )
-            
-            result = json.loads(response['Payload'].read())
-            pods_data = json.loads(result.get('body', '{}'))
-            
-            failed_pods = []
-            for pod in pods_data.get('items', []):
-                status = pod.get('status', {})
-                phase = status.get('phase', '')
-                
-                # Check for failures
-                if phase in ['Failed', 'Unknown']:
-                    failed_pods.append({
-                        'name': pod['metadata']['name'],
-                        'namespace': pod['metadata']['namespace'],
-                        'phase': phase,
-                        'reason': status.get('reason', 'Unknown'),
-                        'message': status.get('message', '')
-                    })
-                
-                # Check container statuses
-                container_statuses = status.get('containerStatuses', [])
-                for container in container_statuses:
-                    state = container.get('state', {})
-                    
-                    if 'waiting' in state:
-                        waiting = state['waiting']
-                        reason = waiting.get('reason', '')
-                        
-                        if reason in ['CrashLoopBackOff', 'ImagePullBackOff', 'ErrImagePull']:
-                            failed_pods.append({
-                                'name': pod['metadata']['name'],
-                                'namespace': pod['metadata']['namespace'],
-                                'container': container['name'],
-                                'phase': 'ContainerFailure',
-                                'reason': reason,
-                                'message': waiting.get('message', '')
-                            })
-            
-            return failed_pods
-            
+            result = self._invoke_kubectl(f'get pods -n {namespace} -o json')
+            body = result.get('body', '{}')
+
+            # With ijson the listing is walked one pod at a time; only the
+            # raw body bytes are held, never the full parsed dict tree
+            if ijson is not None:
+                if isinstance(body, str):
+                    body = body.encode('utf-8')
+                pods = ijson.items(io.BytesIO(body), 'items.item')
+            else:
+                pods = _json_loads(body).get('items', [])
+
+            return list(self._iter_failed(pods))
+
         except Exception as e:
             print(f"Error detecting pod failures: {e}")
             return []
+
+    @staticmethod
+    def _iter_failed(pods) -> Any:
+        """
+        Yield one failure record per failed pod
+
+        A pod in a bad phase whose container is also stuck used to
+        produce two records - and two restart invocations downstream.
+        The container-level reason wins when both are present, since it
+        names the actionable root cause.
+        """
+        seen = set()
+        for pod in pods:
+            status = pod.get('status', {})
+            status_get = status.get
+            metadata = pod['metadata']
+            key = (metadata['namespace'], metadata['name'])
+            if key in seen:
+                continue
+
+            record = None
+            for container in status_get('containerStatuses', []):
+                waiting = container.get('state', {}).get('waiting')
+                if waiting and waiting.get('reason', '') in _BAD_WAIT_REASONS:
+                    record = {
+                        'name': metadata['name'],
+                        'namespace': metadata['namespace'],
+                        'container': container['name'],
+                        'phase': 'ContainerFailure',
+                        'reason': waiting['reason'],
+                        'message': waiting.get('message', '')
+                    }
+                    break
+
+            if record is None and status_get('phase', '') in _BAD_PHASES:
+                record = {
+                    'name': metadata['name'],
+                    'namespace': metadata['namespace'],
+                    'phase': status_get('phase', ''),
+                    'reason': status_get('reason', 'Unknown'),
+                    'message': status_get('message', '')
+                }
+
+            if record is not None:
+                seen.add(key)
+                yield record
     
-    def restart_pod(self, pod_name: str, namespace: str = 'default') -> Dict:
+    def restart_pod(self, pod_name: str, namespace: str = 'default', wait_for_result: bool = False) -> Dict:
         """
         Restart a failed pod by deleting it (K8s will recreate)
+
+        Fire-and-forget by default - the returned dict never carried the
+        kubectl output, so blocking on it bought nothing. Pass
+        wait_for_result=True to block until kubectl finishes.
         """
         try:
-            response = lambda_client.invoke(
-                FunctionName=self.kubectl_lambda,
-                Payload=json.dumps({
-                    'cluster': self.cluster_name,
-                    'command': f'delete pod {pod_name} -n {namespace}'
-                })
-            )
-            
-            result = json.loads(response['Payload'].read())
-            
+            self._invoke_kubectl(f'delete pod {pod_name} -n {namespace}', wait=wait_for_result)
+
             return {
                 'status': 'success',
                 'pod': pod_name,
@@ -113,21 +275,16 @@ class KubernetesAgent:
                 'error': str(e)
             }
     
-    def rollback_deployment(self, deployment_name: str, namespace: str = 'default') -> Dict:
+    def rollback_deployment(self, deployment_name: str, namespace: str = 'default', wait_for_result: bool = False) -> Dict:
         """
         Rollback a deployment to previous revision
         """
         try:
-            response = lambda_client.invoke(
-                FunctionName=self.kubectl_lambda,
-                Payload=json.dumps({
-                    'cluster': self.cluster_name,
-                    'command': f'rollout undo deployment/{deployment_name} -n {namespace}'
-                })
+            self._invoke_kubectl(
+                f'rollout undo deployment/{deployment_name} -n {namespace}',
+                wait=wait_for_result
             )
-            
-            result = json.loads(response['Payload'].read())
-            
+
             return {
                 'status': 'success',
                 'deployment': deployment_name,
@@ -141,21 +298,16 @@ class KubernetesAgent:
                 'error': str(e)
             }
     
-    def scale_deployment(self, deployment_name: str, replicas: int, namespace: str = 'default') -> Dict:
+    def scale_deployment(self, deployment_name: str, replicas: int, namespace: str = 'default', wait_for_result: bool = False) -> Dict:
         """
         Scale a deployment
         """
         try:
-            response = lambda_client.invoke(
-                FunctionName=self.kubectl_lambda,
-                Payload=json.dumps({
-                    'cluster': self.cluster_name,
-                    'command': f'scale deployment/{deployment_name} --replicas={replicas} -n {namespace}'
-                })
+            self._invoke_kubectl(
+                f'scale deployment/{deployment_name} --replicas={replicas} -n {namespace}',
+                wait=wait_for_result
             )
-            
-            result = json.loads(response['Payload'].read())
-            
+
             return {
                 'status': 'success',
                 'deployment': deployment_name,
@@ -175,16 +327,8 @@ class KubernetesAgent:
         Check Horizontal Pod Autoscaler status
         """
         try:
-            response = lambda_client.invoke(
-                FunctionName=self.kubectl_lambda,
-                Payload=json.dumps({
-                    'cluster': self.cluster_name,
-                    'command': f'get hpa -n {namespace} -o json'
-                })
-            )
-            
-            result = json.loads(response['Payload'].read())
-            hpa_data = json.loads(result.get('body', '{}'))
+            result = self._invoke_kubectl(f'get hpa -n {namespace} -o json')
+            hpa_data = _json_loads(result.get('body', '{}'))
             
             hpa_status = []
             for hpa in hpa_data.get('items', []):
@@ -208,6 +352,10 @@ class KubernetesAgent:
             return []
 
 
+# Warm-container agent memo, keyed by cluster name
+_AGENT_CACHE: Dict[str, KubernetesAgent] = {}
+
+
 def handler(event, context):
     """
     Lambda handler for Kubernetes operations
@@ -215,14 +363,17 @@ def handler(event, context):
     cluster_name = event.get('cluster_name', os.environ.get('EKS_CLUSTER_NAME', ''))
     action = event.get('action', 'detect_failures')
     namespace = event.get('namespace', 'default')
+    wait_for_result = bool(event.get('wait_for_result'))
     
     if not cluster_name:
         return {
             'statusCode': 400,
             'body': json.dumps({'error': 'cluster_name required'})
         }
-    
-    k8s_agent = KubernetesAgent(cluster_name)
+
+    k8s_agent = _AGENT_CACHE.get(cluster_name)
+    if k8s_agent is None:
+        k8s_agent = _AGENT_CACHE[cluster_name] = KubernetesAgent(cluster_name)
     
     if action == 'detect_failures':
         failed_pods = k8s_agent.detect_pod_failures(namespace)
@@ -237,14 +388,24 @@ def handler(event, context):
         }
     
     elif action == 'restart_pod':
+        # A pod_names list fans the deletes out concurrently
+        pod_names = event.get('pod_names')
+        if pod_names:
+            results = k8s_agent.restart_pods(pod_names, namespace)
+            failed = any(result['status'] != 'success' for result in results)
+            return {
+                'statusCode': 500 if failed else 200,
+                'body': json.dumps({'results': results, 'count': len(results)})
+            }
+
         pod_name = event.get('pod_name')
         if not pod_name:
             return {
                 'statusCode': 400,
                 'body': json.dumps({'error': 'pod_name required'})
             }
-        
-        result = k8s_agent.restart_pod(pod_name, namespace)
+
+        result = k8s_agent.restart_pod(pod_name, namespace, wait_for_result)
         return {
             'statusCode': 200 if result['status'] == 'success' else 500,
             'body': json.dumps(result)
@@ -258,7 +419,7 @@ def handler(event, context):
                 'body': json.dumps({'error': 'deployment_name required'})
             }
         
-        result = k8s_agent.rollback_deployment(deployment_name, namespace)
+        result = k8s_agent.rollback_deployment(deployment_name, namespace, wait_for_result)
         return {
             'statusCode': 200 if result['status'] == 'success' else 500,
             'body': json.dumps(result)
@@ -274,12 +435,46 @@ def handler(event, context):
                 'body': json.dumps({'error': 'deployment_name required'})
             }
         
-        result = k8s_agent.scale_deployment(deployment_name, replicas, namespace)
+        result = k8s_agent.scale_deployment(deployment_name, replicas, namespace, wait_for_result)
         return {
             'statusCode': 200 if result['status'] == 'success' else 500,
             'body': json.dumps(result)
         }
     
+    elif action == 'bulk_restart_pods':
+        pod_names = event.get('pod_names', [])
+        if not pod_names:
+            return {
+                'statusCode': 400,
+                'body': json.dumps({'error': 'pod_names required'})
+            }
+
+        results = k8s_agent.bulk_exec([
+            f'delete pod {pod_name} -n {namespace}' for pod_name in pod_names
+        ])
+        return {
+            'statusCode': 200,
+            'body': json.dumps({'results': results, 'count': len(results)})
+        }
+
+    elif action == 'bulk_scale':
+        items = event.get('items', [])
+        if not items:
+            return {
+                'statusCode': 400,
+                'body': json.dumps({'error': 'items required'})
+            }
+
+        results = k8s_agent.bulk_exec([
+            f"scale deployment/{item['deployment_name']}"
+            f" --replicas={item.get('replicas', 1)} -n {namespace}"
+            for item in items
+        ])
+        return {
+            'statusCode': 200,
+            'body': json.dumps({'results': results, 'count': len(results)})
+        }
+
     elif action == 'check_hpa':
         hpa_status = k8s_agent.check_hpa_status(namespace)
         
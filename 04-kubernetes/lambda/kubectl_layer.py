@@ -6,11 +6,38 @@ Executes kubectl commands against EKS cluster
 import json
 import os
 import subprocess
+import time
 import boto3
 import base64
 
 eks = boto3.client('eks')
 
+# Cluster endpoint/CA change rarely - cache the rendered kubeconfig per
+# cluster so warm invocations skip the describe_cluster round trip and
+# the /tmp rewrite. Tokens stay fresh regardless: the kubeconfig execs
+# 'aws eks get-token' on every kubectl run.
+_KUBECONFIG_TTL_SECONDS = 300
+_KUBECONFIG_CACHE = {}
+
+
+def get_kubeconfig_path(cluster_name: str):
+    """Return a path to a kubeconfig for the cluster, cached with a TTL"""
+    now = time.monotonic()
+    cached = _KUBECONFIG_CACHE.get(cluster_name)
+    if cached is not None and now < cached[0]:
+        return cached[1]
+
+    kubeconfig = get_cluster_credentials(cluster_name)
+    if not kubeconfig:
+        return None
+
+    path = f'/tmp/kubeconfig-{cluster_name}'
+    with open(path, 'w') as f:
+        json.dump(kubeconfig, f)
+
+    _KUBECONFIG_CACHE[cluster_name] = (now + _KUBECONFIG_TTL_SECONDS, path)
+    return path
+
 
 def get_cluster_credentials(cluster_name: str, region: str = 'us-east-1'):
     """Get EKS cluster credentials"""
@@ -64,33 +91,8 @@ def get_cluster_credentials(cluster_name: str, region: str = 'us-east-1'):
         return None
 
 
-def handler(event, context):
-    """
-    Execute kubectl command
-    """
-    cluster_name = event.get('cluster', '')
-    command = event.get('command', 'get pods')
-    
-    if not cluster_name:
-        return {
-            'statusCode': 400,
-            'body': json.dumps({'error': 'cluster name required'})
-        }
-    
-    # Get cluster credentials
-    kubeconfig = get_cluster_credentials(cluster_name)
-    if not kubeconfig:
-        return {
-            'statusCode': 500,
-            'body': json.dumps({'error': 'Failed to get cluster credentials'})
-        }
-    
-    # Write kubeconfig to /tmp
-    kubeconfig_path = '/tmp/kubeconfig'
-    with open(kubeconfig_path, 'w') as f:
-        json.dump(kubeconfig, f)
-    
-    # Execute kubectl command
+def run_kubectl(kubeconfig_path: str, command: str):
+    """Execute one kubectl command against the written kubeconfig"""
     try:
         result = subprocess.run(
             f'kubectl --kubeconfig={kubeconfig_path} {command}',
@@ -99,7 +101,7 @@ def handler(event, context):
             text=True,
             timeout=30
         )
-        
+
         if result.returncode == 0:
             return {
                 'statusCode': 200,
@@ -113,7 +115,7 @@ def handler(event, context):
                     'returncode': result.returncode
                 })
             }
-            
+
     except subprocess.TimeoutExpired:
         return {
             'statusCode': 500,
@@ -124,3 +126,42 @@ def handler(event, context):
             'statusCode': 500,
             'body': json.dumps({'error': str(e)})
         }
+
+
+def handler(event, context):
+    """
+    Execute kubectl command(s)
+
+    Accepts either a single 'command' or a 'commands' list; the list
+    form runs every command in one invocation against one kubeconfig,
+    so callers pay the credentials fetch and Lambda round trip once per
+    batch instead of once per command.
+    """
+    cluster_name = event.get('cluster', '')
+    command = event.get('command', 'get pods')
+    commands = event.get('commands')
+
+    if not cluster_name:
+        return {
+            'statusCode': 400,
+            'body': json.dumps({'error': 'cluster name required'})
+        }
+
+    # Get cluster credentials (cached across warm invocations)
+    kubeconfig_path = get_kubeconfig_path(cluster_name)
+    if not kubeconfig_path:
+        return {
+            'statusCode': 500,
+            'body': json.dumps({'error': 'Failed to get cluster credentials'})
+        }
+
+    # Bulk mode
+    if commands is not None:
+        return {
+            'statusCode': 200,
+            'body': json.dumps({
+                'results': [run_kubectl(kubeconfig_path, c) for c in commands]
+            })
+        }
+
+    return run_kubectl(kubeconfig_path, command)
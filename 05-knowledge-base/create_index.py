@@ -1,10 +1,12 @@
 import boto3
+import hashlib
 import json
+import random
 import time
 import sys
 from botocore.auth import SigV4Auth
 from botocore.awsrequest import AWSRequest
-import requests
+import urllib3
 
 def create_index(collection_endpoint, region):
     credentials = boto3.Session().get_credentials()
@@ -16,7 +18,12 @@ def create_index(collection_endpoint, region):
     payload = {
         "settings": {
             "index": {
-                "knn": True
+                "knn": True,
+                # Bound query-time graph exploration instead of the
+                # engine default
+                # Serverless collections manage shards, replicas and
+                # refresh themselves and reject those settings
+                "knn.algo_param.ef_search": 64
             }
         },
         "mappings": {
@@ -26,7 +33,26 @@ def create_index(collection_endpoint, region):
                     "dimension": 1536,
                     "method": {
                         "name": "hnsw",
-                        "engine": "faiss"
+                        "engine": "faiss",
+                        "space_type": "l2",
+                        # m=16 keeps graph build CPU and per-vector
+                        # memory modest at 1536 dims; ef_construction
+                        # 128 preserves recall at that width
+                        "parameters": {
+                            "m": 16,
+                            "ef_construction": 128,
+                            "ef_search": 64,
+                            # Scalar-quantize stored vectors to fp16:
+                            # halves vector heap and disk, and the
+                            # Bedrock-managed ingestion keeps writing
+                            # fp32 floats unchanged
+                            "encoder": {
+                                "name": "sq",
+                                "parameters": {
+                                    "type": "fp16"
+                                }
+                            }
+                        }
                     }
                 },
                 "text": {
@@ -39,34 +65,50 @@ def create_index(collection_endpoint, region):
         }
     }
     
-    body = json.dumps(payload)
-    
+    # Encode once; every retry reuses the same bytes
+    body = json.dumps(payload).encode('utf-8')
+
+    # One pool manager keeps the TLS connection to the collection
+    # endpoint alive across retries instead of handshaking every
+    # attempt; urllib3 is already loaded as part of botocore, so this
+    # also drops the requests import graph from startup
+    http = urllib3.PoolManager(num_pools=1, maxsize=2, retries=False)
+
+    # The body never changes between attempts, so sign against a
+    # precomputed payload hash; each retry still builds a fresh
+    # AWSRequest for its timestamp, but skips re-hashing the body
+    signer = SigV4Auth(credentials, service, region)
+    payload_hash = hashlib.sha256(body).hexdigest()
+
     # Retry loop for eventual consistency
     for i in range(30):
         try:
             request = AWSRequest(method='PUT', url=url, data=body)
-            SigV4Auth(credentials, service, region).add_auth(request)
+            request.headers['X-Amz-Content-SHA256'] = payload_hash
+            signer.add_auth(request)
             
             headers = dict(request.headers)
             headers['Content-Type'] = 'application/json'
             
-            r = requests.put(url, headers=headers, data=body)
+            r = http.request('PUT', url, body=body, headers=headers)
             
-            if r.status_code == 200:
+            if r.status == 200:
                 print("Index created successfully")
                 return
-            elif "resource_already_exists_exception" in r.text:
+            elif b"resource_already_exists_exception" in r.data:
                  print("Index already exists")
                  return
-            elif r.status_code == 403:
+            elif r.status == 403:
                 print(f"Waiting for IAM propagation (attempt {i+1}/30)...")
             else:
-                print(f"Failed to create index (attempt {i+1}): {r.status_code} {r.text}")
+                print(f"Failed to create index (attempt {i+1}): {r.status} {r.data.decode(errors='replace')}")
                 
         except Exception as e:
             print(f"Error (attempt {i+1}): {e}")
             
-        time.sleep(20)
+        # Back off quickly at first - IAM propagation usually completes
+        # within a few seconds - and cap the wait at the old fixed 20s
+        time.sleep(min(2 ** i, 20) * (0.5 + random.random() / 2))
         
     sys.exit(1)
 
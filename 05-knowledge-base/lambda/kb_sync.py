@@ -6,12 +6,23 @@ Syncs incident postmortems from DynamoDB to S3 for Bedrock Knowledge Base
 import json
 import os
 import boto3
+from botocore.config import Config
 from datetime import datetime
 from typing import Dict, List
 
-s3 = boto3.client('s3')
-dynamodb = boto3.client('dynamodb')
-bedrock_agent = boto3.client('bedrock-agent')
+# The sync loop makes one S3 PUT per incident - keep-alive pooling
+# reuses the connection instead of handshaking per upload
+_CFG = Config(
+    retries={'total_max_attempts': 5, 'mode': 'adaptive'},
+    max_pool_connections=50,
+    tcp_keepalive=True,
+    connect_timeout=2,
+    read_timeout=30
+)
+
+s3 = boto3.client('s3', config=_CFG)
+dynamodb = boto3.client('dynamodb', config=_CFG)
+bedrock_agent = boto3.client('bedrock-agent', config=_CFG)
 
 KNOWLEDGE_BASE_ID = os.environ['KNOWLEDGE_BASE_ID']
 DATA_SOURCE_ID = os.environ['DATA_SOURCE_ID']
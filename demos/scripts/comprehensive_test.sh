@@ -75,7 +75,7 @@ aws lambda invoke \
     --payload file:///tmp/ml_test.json \
     /tmp/ml_response.json >/dev/null 2>&1
 
-anomaly_count=$(jq -r '.body | fromjson | .anomaly_count' /tmp/ml_response.json 2>/dev/null || echo "0")
+anomaly_count=$(jq -r '.body.anomaly_count' /tmp/ml_response.json 2>/dev/null || echo "0")
 
 if [ "$anomaly_count" -gt 0 ]; then
     log_success "ML Anomaly Detection: Found $anomaly_count anomalies"
@@ -98,7 +98,7 @@ aws lambda invoke \
     --payload file:///tmp/pattern_test.json \
     /tmp/pattern_response.json >/dev/null 2>&1
 
-patterns=$(jq -r '.body | fromjson | .patterns' /tmp/pattern_response.json 2>/dev/null)
+patterns=$(jq -r '.body.patterns' /tmp/pattern_response.json 2>/dev/null)
 
 if [ -n "$patterns" ]; then
     log_success "ML Pattern Recognition: Working"
@@ -53,7 +53,9 @@ function monitor_incident() {
                 log "Workflow finished."
                 
                 # Check results
-                remediation=$(echo $response | jq -r '.Item.remediation_plan.S // "{}"')
+                # remediation_plan is stored as a gzip-compressed Binary attribute
+                remediation=$(echo $response | jq -r '.Item.remediation_plan.B // empty' | base64 -d 2>/dev/null | gunzip 2>/dev/null)
+                remediation=${remediation:-"{}"}
                 if [ "$remediation_status" == "pending_approval" ]; then
                     echo -e "${RED}[RISK AGENT] BLOCKED Auto-Execution.${NC}"
                     echo -e "Reason: High Risk / Production DB Modification"
@@ -0,0 +1,26 @@
+"""Unit tests for agent_framework helpers"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '01-multi-agent', 'lambda'))
+
+from agent_framework import BedrockCache, json_dumps  # noqa: E402
+
+
+def test_json_dumps_sort_keys():
+    unsorted = json_dumps({'b': 1, 'a': 2}, sort_keys=True)
+    assert unsorted == '{"a":2,"b":1}' or unsorted == '{"a": 2, "b": 1}'
+
+
+def test_cache_key_is_stable():
+    key = BedrockCache.cache_key('some prompt', 1024, 0.1)
+    assert len(key) == 64
+    assert key == BedrockCache.cache_key('some prompt', 1024, 0.1)
+
+
+def test_cache_key_varies_with_inputs():
+    base = BedrockCache.cache_key('some prompt', 1024, 0.1)
+    assert base != BedrockCache.cache_key('other prompt', 1024, 0.1)
+    assert base != BedrockCache.cache_key('some prompt', 512, 0.1)
+    assert base != BedrockCache.cache_key('some prompt', 1024, 0.0)